@@ -0,0 +1,129 @@
+<?php
+
+declare(strict_types=1);
+
+namespace App\Console\Commands;
+
+use Aws\CloudWatch\CloudWatchClient;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\Queue;
+
+/**
+ * Publishes Redis queue depth to CloudWatch so the Horizon worker ECS service
+ * can scale on backlog (see infrastructure/pulumi/infrastructure/ecs.py).
+ *
+ * Runs alongside Horizon in the worker task; with --interval it loops forever,
+ * otherwise it publishes a single data point and exits.
+ */
+class PublishQueueMetrics extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'queue:publish-metrics
+                            {--interval=0 : Seconds between publishes (0 = publish once and exit)}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Publish Redis queue depth to CloudWatch for worker autoscaling';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(): int
+    {
+        $interval = max(0, (int) $this->option('interval'));
+        $client = $this->client();
+
+        do {
+            $depths = $this->queueDepths();
+
+            $client->putMetricData([
+                'Namespace' => config('services.queue_metrics.namespace'),
+                'MetricData' => $this->metricData($depths),
+            ]);
+
+            $this->info(sprintf('Published queue depth: %d pending job(s)', array_sum($depths)));
+
+            if ($interval > 0) {
+                sleep($interval);
+            }
+        } while ($interval > 0);
+
+        return Command::SUCCESS;
+    }
+
+    /**
+     * Pending job count per queue, for every queue Horizon supervises in this environment.
+     *
+     * Only the scaled worker service's queues count; the `<env>-long` supervisors
+     * (including `default`) run on a fixed-size service that never scales.
+     *
+     * @return array<string, int>
+     */
+    private function queueDepths(): array
+    {
+        $supervisors = config('horizon.environments.' . app()->environment(), []);
+
+        $queues = collect($supervisors)
+            ->pluck('queue')
+            ->flatten()
+            ->unique()
+            ->values();
+
+        $connection = Queue::connection('redis');
+
+        return $queues
+            ->mapWithKeys(fn (string $queue) => [$queue => (int) $connection->size($queue)])
+            ->all();
+    }
+
+    /**
+     * Total backlog (the autoscaling signal) plus a per-queue breakdown for dashboards.
+     *
+     * @param array<string, int> $depths
+     */
+    private function metricData(array $depths): array
+    {
+        $environment = config('services.queue_metrics.environment');
+
+        $data = [[
+            'MetricName' => 'PendingJobs',
+            'Dimensions' => [['Name' => 'Environment', 'Value' => $environment]],
+            'Value' => array_sum($depths),
+            'Unit' => 'Count',
+        ]];
+
+        foreach ($depths as $queue => $depth) {
+            $data[] = [
+                'MetricName' => 'PendingJobs',
+                'Dimensions' => [
+                    ['Name' => 'Environment', 'Value' => $environment],
+                    ['Name' => 'Queue', 'Value' => $queue],
+                ],
+                'Value' => $depth,
+                'Unit' => 'Count',
+            ];
+        }
+
+        return $data;
+    }
+
+    private function client(): CloudWatchClient
+    {
+        if (app()->bound(CloudWatchClient::class)) {
+            return app(CloudWatchClient::class);
+        }
+
+        // Credentials come from the ECS task role via the default provider chain
+        return new CloudWatchClient([
+            'version' => 'latest',
+            'region' => config('services.queue_metrics.region'),
+        ]);
+    }
+}
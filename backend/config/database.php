@@ -83,7 +83,7 @@ return [
             ]) : [],
         ],
 
-        'pgsql' => [
+        'pgsql' => array_merge([
             'driver' => 'pgsql',
             'url' => env('DB_URL'),
             'host' => env('DB_HOST', '127.0.0.1'),
@@ -96,7 +96,13 @@ return [
             'prefix_indexes' => true,
             'search_path' => 'public',
             'sslmode' => 'prefer',
-        ],
+        ], env('DB_READ_HOST') ? [
+            // Aurora reader endpoint (set by infrastructure/pulumi when readers exist).
+            // SELECTs go to the readers; sticky keeps read-after-write on the writer.
+            'read' => ['host' => [env('DB_READ_HOST')]],
+            'write' => ['host' => [env('DB_HOST', '127.0.0.1')]],
+            'sticky' => true,
+        ] : []),
 
         // Publishing Platform (Day.News) read-only replica connection.
         // Set PP_DB_URL to the Railway Postgres connection URL, or use individual PP_DB_* vars.
@@ -182,9 +188,11 @@ return [
             'backoff_cap' => env('REDIS_BACKOFF_CAP', 1000),
         ],
 
+        // REDIS_CACHE_HOST / REDIS_SESSION_HOST point cache and sessions at their own
+        // replication groups (allkeys-lru vs noeviction); unset, they share REDIS_HOST.
         'cache' => [
             'url' => env('REDIS_URL'),
-            'host' => env('REDIS_HOST', '127.0.0.1'),
+            'host' => env('REDIS_CACHE_HOST', env('REDIS_HOST', '127.0.0.1')),
             'username' => env('REDIS_USERNAME'),
             'password' => env('REDIS_PASSWORD'),
             'port' => env('REDIS_PORT', '6379'),
@@ -195,6 +203,45 @@ return [
             'backoff_cap' => env('REDIS_BACKOFF_CAP', 1000),
         ],
 
+        'session' => [
+            'url' => env('REDIS_URL'),
+            'host' => env('REDIS_SESSION_HOST', env('REDIS_HOST', '127.0.0.1')),
+            'username' => env('REDIS_USERNAME'),
+            'password' => env('REDIS_PASSWORD'),
+            'port' => env('REDIS_PORT', '6379'),
+            'database' => env('REDIS_SESSION_DB', '2'),
+            'max_retries' => env('REDIS_MAX_RETRIES', 3),
+            'backoff_algorithm' => env('REDIS_BACKOFF_ALGORITHM', 'decorrelated_jitter'),
+            'backoff_base' => env('REDIS_BACKOFF_BASE', 100),
+            'backoff_cap' => env('REDIS_BACKOFF_CAP', 1000),
+        ],
+
+        // ElastiCache cluster mode for the cache and session groups (configuration
+        // endpoints in REDIS_CACHE_HOST / REDIS_SESSION_HOST). Select them with
+        // REDIS_CACHE_CONNECTION=cache-cluster / SESSION_CONNECTION=session-cluster.
+        // Queues and Horizon stay on `default`: queue keys aren't hash-tagged, so their
+        // multi-key Lua scripts would fail with CROSSSLOT. Cluster mode only has database 0.
+        'clusters' => [
+            'cache-cluster' => [
+                [
+                    'host' => env('REDIS_CACHE_HOST', env('REDIS_HOST', '127.0.0.1')),
+                    'username' => env('REDIS_USERNAME'),
+                    'password' => env('REDIS_PASSWORD'),
+                    'port' => env('REDIS_PORT', '6379'),
+                    'database' => 0,
+                ],
+            ],
+            'session-cluster' => [
+                [
+                    'host' => env('REDIS_SESSION_HOST', env('REDIS_HOST', '127.0.0.1')),
+                    'username' => env('REDIS_USERNAME'),
+                    'password' => env('REDIS_PASSWORD'),
+                    'port' => env('REDIS_PORT', '6379'),
+                    'database' => 0,
+                ],
+            ],
+        ],
+
     ],
 
 ];
@@ -149,7 +149,37 @@ return [
     */
 
     'environments' => [
+        // Scaled, Spot-eligible worker service (php artisan horizon). ECS gives a
+        // stopping task at most 120s (scale-in, Spot interruption, deploy) before
+        // SIGKILL, so every supervisor here, and every job it runs, must finish
+        // within that: keep `timeout` (and any job $timeout) below 120.
         'production' => [
+            // Telephony / voice: ringless voicemail, SMS, outbound calls, voicemail.
+            'supervisor-telephony' => [
+                'connection' => 'redis',
+                'queue' => ['rvm', 'sms', 'calls', 'voicemail'],
+                'balance' => 'auto',
+                'minProcesses' => 2,
+                'maxProcesses' => 12,
+                'tries' => 3,
+                'timeout' => 110,
+            ],
+            'supervisor-ai' => [
+                'connection' => 'redis',
+                'queue' => ['ai', 'ai-high'],
+                'balance' => 'auto',
+                'minProcesses' => 3,
+                'maxProcesses' => 15,
+                'tries' => 2,
+                'timeout' => 60,
+            ],
+        ],
+        // Fixed-size, on-demand worker service (php artisan horizon
+        // --environment=production-long): never scaled in or placed on Spot, for
+        // queues whose jobs run past the 120s stop window (email pre-flight and
+        // re-scrub up to 1800s, maintenance up to 7200s, emergency 600s,
+        // messages 300s).
+        'production-long' => [
             'supervisor-email' => [
                 'connection' => 'redis',
                 'queue' => ['emails', 'email-high'],
@@ -200,25 +230,6 @@ return [
                 'tries' => 3,
                 'timeout' => 120,
             ],
-            // Telephony / voice: ringless voicemail, SMS, outbound calls, voicemail.
-            'supervisor-telephony' => [
-                'connection' => 'redis',
-                'queue' => ['rvm', 'sms', 'calls', 'voicemail'],
-                'balance' => 'auto',
-                'minProcesses' => 2,
-                'maxProcesses' => 12,
-                'tries' => 3,
-                'timeout' => 120,
-            ],
-            'supervisor-ai' => [
-                'connection' => 'redis',
-                'queue' => ['ai', 'ai-high'],
-                'balance' => 'auto',
-                'minProcesses' => 3,
-                'maxProcesses' => 15,
-                'tries' => 2,
-                'timeout' => 60,
-            ],
             // Alerts + emergency broadcasts. Emergency listed first for priority.
             'supervisor-alerts' => [
                 'connection' => 'redis',
@@ -125,4 +125,11 @@ return [
         'secret' => env('PUBLISHING_PLATFORM_SECRET', ''),
     ],
 
+    // Queue depth metric consumed by the Horizon worker autoscaling policy (queue:publish-metrics)
+    'queue_metrics' => [
+        'namespace' => env('QUEUE_METRICS_NAMESPACE', 'LearningCenter/Queues'),
+        'environment' => env('QUEUE_METRICS_ENVIRONMENT', env('APP_ENV', 'production')),
+        'region' => env('AWS_DEFAULT_REGION', 'us-east-1'),
+    ],
+
 ];
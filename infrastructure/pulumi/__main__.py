@@ -8,11 +8,14 @@ import pulumi_aws as aws
 from infrastructure.vpc import create_vpc
 from infrastructure.vpc_existing import use_existing_vpc
 from infrastructure.rds import create_rds
-from infrastructure.redis import create_redis
-from infrastructure.ecs import create_ecs_cluster
+from infrastructure.redis import create_redis, redis_endpoint, redis_workload_modes
+from infrastructure.autoscaling import request_count_resource_label
+from infrastructure.ecs import capacity_provider_settings, create_ecs_cluster, web_container_port
+from infrastructure.codedeploy import blue_green_settings, create_blue_green_deployment
 from infrastructure.s3 import create_s3_buckets
-from infrastructure.cloudfront import create_cloudfront
-from infrastructure.alb import create_alb
+from infrastructure.cloudfront import create_assets_cloudfront, create_cloudfront
+from infrastructure.alb import DEFAULT_SSL_POLICY, create_alb
+from infrastructure.route53 import create_acm_certificate, create_alb_alias_record, validate_acm_certificate
 from infrastructure.secrets import create_secrets
 from infrastructure.ecr import create_ecr_repository
 
@@ -28,16 +31,20 @@ existing_vpc_id = config.get("existing_vpc_id", None)
 
 # Get VPC - use existing or create new
 if should_use_existing_vpc and existing_vpc_id:
-    vpc, public_subnets, private_subnets, database_subnets, db_subnet_group = use_existing_vpc(
+    vpc, public_subnets, private_subnets, database_subnets, db_subnet_group, subnet_report = use_existing_vpc(
         project_name=project_name,
         environment=environment,
         vpc_id=existing_vpc_id,
+        endpoints=config.get_object("vpc_endpoints"),
+        subnets=config.get_object("existing_vpc_subnets"),
     )
 else:
     vpc, public_subnets, private_subnets, database_subnets, db_subnet_group = create_vpc(
         project_name=project_name,
         environment=environment,
+        endpoints=config.get_object("vpc_endpoints"),
     )
+    subnet_report = None
 
 # Create Secrets Manager secrets
 api_secrets = create_secrets(
@@ -52,23 +59,37 @@ ecr_repo, ecr_repo_url = create_ecr_repository(
 )
 
 # Create RDS PostgreSQL with pgvector
-rds_cluster, rds_secret = create_rds(
+rds_cluster, rds_secret, rds_proxy, rds_read_endpoint = create_rds(
     project_name=project_name,
     environment=environment,
     vpc_id=vpc.id,
     subnets=database_subnets,
     db_subnet_group_name=db_subnet_group.name,
     security_group_tags={"Name": f"{project_name}-rds-sg"},
+    db_proxy=config.get_object("db_proxy"),
+    db_readers=config.get_object("db_readers"),
+    db_capacity_mode=config.get("db_capacity_mode") or "provisioned",
+    db_serverless=config.get_object("db_serverless"),
+    db_tuning_profile=config.get("db_tuning_profile") or "default",
+    db_parameter_overrides=config.get_object("db_parameter_overrides"),
+    db_monitoring=config.get_object("db_monitoring"),
 )
 
 # Create ElastiCache Redis
-redis_cluster = create_redis(
+redis_settings = config.get_object("redis") or {}
+# Only the cache and session groups may run cluster mode; queues and Horizon need a non-cluster group
+redis_modes = redis_workload_modes(redis_settings)
+redis_groups = create_redis(
     project_name=project_name,
     environment=environment,
     vpc_id=vpc.id,
     subnets=private_subnets,
     security_group_tags={"Name": f"{project_name}-redis-sg"},
+    settings=redis_settings,
 )
+# Separate cache/queue/session groups when the `workloads` map is set
+redis_split = bool(redis_settings.get("workloads"))
+redis_cluster = redis_groups["queue"]
 
 # Create S3 buckets
 s3_buckets = create_s3_buckets(
@@ -76,52 +97,150 @@ s3_buckets = create_s3_buckets(
     environment=environment,
 )
 
-# Create CloudFront distribution
+# HTTPS for the ALB: bring a certificate (alb_certificate_arn) or have one issued for
+# api_domain, validated through the Route53 zone in hosted_zone_id
+api_domain = config.get("api_domain")
+hosted_zone_id = config.get("hosted_zone_id")
+alb_certificate_arn = config.get("alb_certificate_arn")
+if not alb_certificate_arn and api_domain and hosted_zone_id:
+    alb_certificate = create_acm_certificate(
+        domain_name=api_domain,
+        project_name=project_name,
+        environment=environment,
+        region=aws.config.region,  # ALB certificates live in the ALB's region
+    )
+    alb_certificate_arn = validate_acm_certificate(
+        zone_id=hosted_zone_id,
+        certificate=alb_certificate,
+        project_name=project_name,
+    ).certificate_arn
+if alb_certificate_arn and not api_domain:
+    raise ValueError("api_domain is required with an ALB certificate; CloudFront reaches the ALB by that name")
+
+# Web service rollouts: ECS rolling updates (default) or CodeDeploy blue/green across two target groups
+deployment_controller = config.get("deployment_controller", "ECS").upper()
+blue_green = blue_green_settings(config.get_object("blue_green")) if deployment_controller == "CODE_DEPLOY" else None
+
+# Create Application Load Balancer (before CloudFront and ECS, which route to it)
+alb, target_group, alb_sg, blue_green_targets = create_alb(
+    project_name=project_name,
+    environment=environment,
+    vpc_id=vpc.id,
+    public_subnets=public_subnets,
+    certificate_arn=alb_certificate_arn,
+    ssl_policy=config.get("alb_ssl_policy") or DEFAULT_SSL_POLICY,
+    target_group=config.get_object("target_group"),
+    blue_green=blue_green,
+)
+if api_domain and hosted_zone_id:
+    create_alb_alias_record(
+        zone_id=hosted_zone_id,
+        domain_name=api_domain,
+        alb_dns=alb.dns_name,
+        alb_zone_id=alb.zone_id,
+        project_name=project_name,
+        environment=environment,
+    )
+
+# Create CloudFront distribution (frontend from S3, /api/* from the ALB)
 cloudfront_distribution = create_cloudfront(
     project_name=project_name,
     environment=environment,
     s3_bucket=s3_buckets["frontend"],
+    alb=alb,
+    alb_origin_domain=api_domain if alb_certificate_arn else None,
+    settings=config.get_object("cloudfront"),
 )
 
-# Create Application Load Balancer (before ECS to get target group)
-alb, target_group, alb_sg = create_alb(
+# Create CloudFront distribution for the assets bucket (media, signed URLs)
+assets_distribution, assets_signing_key = create_assets_cloudfront(
     project_name=project_name,
     environment=environment,
-    vpc_id=vpc.id,
-    public_subnets=public_subnets,
+    s3_bucket=s3_buckets["assets"],
+    settings=config.get_object("assets_cdn"),
 )
 
+# Web tier runtime: nginx + php-fpm (default) or Laravel Octane; only the web task changes
+runtime_mode = config.get("runtime_mode", "fpm")
+octane_settings = config.get_object("octane")
+
 # Create ECS Cluster (with ALB target group)
-ecs_cluster, ecs_service, task_definition, ecs_sg = create_ecs_cluster(
+(
+    ecs_cluster, ecs_service, task_definition, ecs_sg, worker_service, long_worker_service, scheduler_service,
+) = create_ecs_cluster(
     project_name=project_name,
     environment=environment,
     vpc_id=vpc.id,
     public_subnets=public_subnets,
     private_subnets=private_subnets,
-    database_url=rds_cluster.endpoint,
+    # Connect through RDS Proxy when it is enabled so php-fpm connections are pooled
+    database_url=rds_proxy.endpoint if rds_proxy else rds_cluster.endpoint,
+    database_read_url=rds_read_endpoint,
     database_secret_arn=rds_secret.arn,
-    redis_endpoint=redis_cluster.primary_endpoint_address,
+    redis_endpoint=redis_endpoint(redis_cluster, redis_modes["queue"]),
     redis_port=redis_cluster.port,
+    redis_cluster_workloads=tuple(workload for workload, mode in redis_modes.items() if mode == "cluster"),
+    redis_cache_endpoint=redis_endpoint(redis_groups["cache"], redis_modes["cache"]) if redis_split else None,
+    redis_session_endpoint=redis_endpoint(redis_groups["session"], redis_modes["session"]) if redis_split else None,
     api_secrets={
         'openai': api_secrets['openai'],
         'elevenlabs': api_secrets['elevenlabs'],
         'openrouter': api_secrets['openrouter'],
     },
     target_group_arn=target_group.arn,
+    # Requests per target follows one target group, which sits idle after every other blue/green release
+    request_count_resource_label=(
+        request_count_resource_label(alb.arn_suffix, target_group.arn_suffix) if not blue_green else None
+    ),
+    autoscaling=config.get_object("autoscaling"),
+    worker=config.get_object("worker"),
+    scheduler=config.get_object("scheduler"),
+    long_worker=config.get_object("long_worker"),
+    batch_jobs=config.get_object("batch_jobs"),
+    image=pulumi.Output.concat(ecr_repo_url, ":latest"),
+    # ARM64 runs on Graviton; deploy.sh pushes a multi-arch image so either works
+    cpu_architecture=config.get("cpu_architecture", "X86_64"),
+    capacity_providers=config.get_object("capacity_providers"),
+    php_runtime=config.get_object("php_runtime"),
+    runtime_mode=runtime_mode,
+    octane=octane_settings,
+    octane_image=pulumi.Output.concat(ecr_repo_url, ":octane"),
+    deployment=config.get_object("deployment"),
+    deployment_controller=deployment_controller,
 )
 
 # Allow ALB to communicate with ECS tasks
 aws.ec2.SecurityGroupRule(
     f"{project_name}-alb-to-ecs",
     type="ingress",
-    from_port=80,
-    to_port=80,
+    from_port=web_container_port(runtime_mode, octane_settings),
+    to_port=web_container_port(runtime_mode, octane_settings),
     protocol="tcp",
     source_security_group_id=alb_sg.id,
     security_group_id=ecs_sg.id,
     description="Allow ALB to communicate with ECS tasks",
 )
 
+# CodeDeploy blue/green for the web service: canary/linear traffic shifts with p99/5xx rollback alarms
+codedeploy_app = None
+if blue_green:
+    codedeploy_app, codedeploy_group, codedeploy_revision = create_blue_green_deployment(
+        project_name=project_name,
+        environment=environment,
+        cluster_name=ecs_cluster.name,
+        service_name=ecs_service.name,
+        alb_arn_suffix=alb.arn_suffix,
+        target_group_names=[target_group.name, blue_green_targets["green_target_group"].name],
+        production_listener_arn=blue_green_targets["production_listener"].arn,
+        test_listener_arn=blue_green_targets["test_listener"].arn,
+        task_definition_arn=task_definition.arn,
+        container_port=web_container_port(runtime_mode, octane_settings),
+        capacity=capacity_provider_settings(
+            config.get_object("capacity_providers"), config.get("cpu_architecture", "X86_64"),
+        )["web"],
+        settings=blue_green,
+    )
+
 # Update ECS service to use load balancer
 # Note: This requires updating the service after ALB is created
 # For now, the service is created without load balancer
@@ -129,12 +248,38 @@ aws.ec2.SecurityGroupRule(
 
 # Export outputs
 pulumi.export("vpc_id", vpc.id)
+if subnet_report:
+    pulumi.export("subnet_report", subnet_report)
 pulumi.export("rds_endpoint", rds_cluster.endpoint)
 pulumi.export("rds_secret_arn", rds_secret.arn)
-pulumi.export("redis_endpoint", redis_cluster.primary_endpoint_address)
+if rds_proxy:
+    pulumi.export("rds_proxy_endpoint", rds_proxy.endpoint)
+if rds_read_endpoint:
+    pulumi.export("rds_read_endpoint", rds_read_endpoint)
+pulumi.export("redis_endpoint", redis_endpoint(redis_cluster, redis_modes["queue"]))
+if redis_split:
+    pulumi.export("redis_cache_endpoint", redis_endpoint(redis_groups["cache"], redis_modes["cache"]))
+    pulumi.export("redis_session_endpoint", redis_endpoint(redis_groups["session"], redis_modes["session"]))
 pulumi.export("alb_dns_name", alb.dns_name)
 pulumi.export("cloudfront_url", cloudfront_distribution.domain_name)
+pulumi.export("cloudfront_distribution_id", cloudfront_distribution.id)
 pulumi.export("s3_frontend_bucket", s3_buckets["frontend"].id)
+pulumi.export("s3_assets_bucket", s3_buckets["assets"].id)
+pulumi.export("assets_cdn_url", pulumi.Output.concat("https://", assets_distribution.domain_name))
+if assets_signing_key:
+    # CloudFront signed URLs carry the public key id as Key-Pair-Id
+    pulumi.export("assets_cdn_key_pair_id", assets_signing_key.id)
 pulumi.export("ecs_cluster_name", ecs_cluster.name)
 pulumi.export("ecs_service_name", ecs_service.name)
+if worker_service:
+    pulumi.export("ecs_worker_service_name", worker_service.name)
+if long_worker_service:
+    pulumi.export("ecs_long_worker_service_name", long_worker_service.name)
+if scheduler_service:
+    pulumi.export("ecs_scheduler_service_name", scheduler_service.name)
 pulumi.export("ecr_repository_url", ecr_repo_url)
+if codedeploy_app:
+    # deploy.sh starts releases with these instead of `aws ecs update-service`
+    pulumi.export("codedeploy_application", codedeploy_app.name)
+    pulumi.export("codedeploy_deployment_group", codedeploy_group.deployment_group_name)
+    pulumi.export("codedeploy_revision", codedeploy_revision)
@@ -104,19 +104,6 @@ S3_BUCKET=$(pulumi stack output s3_frontend_bucket --stack "$PULUMI_STACK")
 echo -e "${GREEN}✅ Outputs retrieved${NC}"
 echo ""
 
-# Build and push Docker image
-echo "🐳 Building Docker image..."
-cd ../..
-docker build -f infrastructure/pulumi/Dockerfile -t "$ECR_URL:latest" .
-
-if [ $? -ne 0 ]; then
-    echo -e "${RED}❌ Docker build failed${NC}"
-    exit 1
-fi
-
-echo -e "${GREEN}✅ Docker image built${NC}"
-echo ""
-
 # Login to ECR
 echo "🔐 Logging into ECR..."
 aws ecr get-login-password --region "$REGION" | docker login --username AWS --password-stdin "$ECR_URL"
@@ -129,15 +116,43 @@ fi
 echo -e "${GREEN}✅ Logged into ECR${NC}"
 echo ""
 
-# Push image
-echo "📤 Pushing Docker image to ECR..."
-docker push "$ECR_URL:latest"
+# Build and push a multi-arch image (one manifest list for x86_64 and Graviton tasks), so
+# switching the cpu_architecture config never needs a rebuild. Cross-building needs QEMU
+# binfmt handlers on hosts without them: docker run --privileged --rm tonistiigi/binfmt --install all
+IMAGE_PLATFORMS="${IMAGE_PLATFORMS:-linux/amd64,linux/arm64}"
+BUILDX_BUILDER="${BUILDX_BUILDER:-$PROJECT_NAME-builder}"
 
-if [ $? -ne 0 ]; then
-    echo -e "${RED}❌ Docker push failed${NC}"
-    exit 1
+echo "🐳 Building and pushing Docker images for $IMAGE_PLATFORMS..."
+if ! docker buildx inspect "$BUILDX_BUILDER" &> /dev/null; then
+    # The default docker driver can't build manifest lists
+    docker buildx create --name "$BUILDX_BUILDER" --driver docker-container > /dev/null
 fi
 
+# :latest is nginx + php-fpm (also used by Horizon, the scheduler and batch jobs); :octane is the
+# Octane web image. Both are always pushed so switching runtime_mode is only a config change
+cd ../..
+for TARGET in fpm octane; do
+    if [ "$TARGET" = "octane" ]; then
+        TARGET_ARGS=(--target octane -t "$ECR_URL:octane")
+    else
+        TARGET_ARGS=(-t "$ECR_URL:latest")
+    fi
+
+    docker buildx build \
+        --builder "$BUILDX_BUILDER" \
+        --platform "$IMAGE_PLATFORMS" \
+        -f infrastructure/pulumi/Dockerfile \
+        "${TARGET_ARGS[@]}" \
+        --push \
+        .
+
+    if [ $? -ne 0 ]; then
+        echo -e "${RED}❌ Docker build failed ($TARGET)${NC}"
+        exit 1
+    fi
+done
+cd infrastructure/pulumi
+
 echo -e "${GREEN}✅ Docker image pushed${NC}"
 echo ""
 
@@ -146,21 +161,61 @@ echo "🔄 Updating ECS service..."
 CLUSTER_NAME=$(pulumi stack output ecs_cluster_name --stack "$PULUMI_STACK")
 SERVICE_NAME=$(pulumi stack output ecs_service_name --stack "$PULUMI_STACK")
 
-aws ecs update-service \
-    --cluster "$CLUSTER_NAME" \
-    --service "$SERVICE_NAME" \
-    --force-new-deployment \
-    --region "$REGION" > /dev/null
+# With deployment_controller CODE_DEPLOY the web service only changes through a CodeDeploy
+# blue/green deployment: new tasks start behind the test listener, traffic shifts by the
+# configured canary/linear steps, and the p99 latency/5xx alarms roll it back
+CODEDEPLOY_APP=$(pulumi stack output codedeploy_application --stack "$PULUMI_STACK" 2>/dev/null || true)
+DEPLOYMENT_ID=""
+if [ -n "$CODEDEPLOY_APP" ]; then
+    DEPLOYMENT_ID=$(aws deploy create-deployment \
+        --application-name "$CODEDEPLOY_APP" \
+        --deployment-group-name "$(pulumi stack output codedeploy_deployment_group --stack "$PULUMI_STACK")" \
+        --revision "$(pulumi stack output codedeploy_revision --stack "$PULUMI_STACK")" \
+        --query deploymentId \
+        --output text \
+        --region "$REGION")
+    echo "Blue/green deployment started: $DEPLOYMENT_ID"
+else
+    aws ecs update-service \
+        --cluster "$CLUSTER_NAME" \
+        --service "$SERVICE_NAME" \
+        --force-new-deployment \
+        --region "$REGION" > /dev/null
+fi
+
+# Horizon queue workers (scaled and long-running) and the scheduler run the same image as separate services
+WORKER_SERVICE_NAME=$(pulumi stack output ecs_worker_service_name --stack "$PULUMI_STACK" 2>/dev/null || true)
+LONG_WORKER_SERVICE_NAME=$(pulumi stack output ecs_long_worker_service_name --stack "$PULUMI_STACK" 2>/dev/null || true)
+SCHEDULER_SERVICE_NAME=$(pulumi stack output ecs_scheduler_service_name --stack "$PULUMI_STACK" 2>/dev/null || true)
+for BACKGROUND_SERVICE in $WORKER_SERVICE_NAME $LONG_WORKER_SERVICE_NAME $SCHEDULER_SERVICE_NAME; do
+    aws ecs update-service \
+        --cluster "$CLUSTER_NAME" \
+        --service "$BACKGROUND_SERVICE" \
+        --force-new-deployment \
+        --region "$REGION" > /dev/null
+done
 
 echo -e "${GREEN}✅ ECS service updated${NC}"
 echo ""
 
 # Wait for service to stabilize
 echo "⏳ Waiting for ECS service to stabilize..."
-aws ecs wait services-stable \
-    --cluster "$CLUSTER_NAME" \
-    --services "$SERVICE_NAME" \
-    --region "$REGION"
+if [ -n "$DEPLOYMENT_ID" ]; then
+    # Succeeds once traffic has fully shifted and the old tasks are gone; fails on rollback
+    if ! aws deploy wait deployment-successful --deployment-id "$DEPLOYMENT_ID" --region "$REGION"; then
+        echo -e "${RED}❌ Blue/green deployment $DEPLOYMENT_ID did not succeed (rolled back or stopped)${NC}"
+        exit 1
+    fi
+    STABLE_SERVICES="$WORKER_SERVICE_NAME $LONG_WORKER_SERVICE_NAME $SCHEDULER_SERVICE_NAME"
+else
+    STABLE_SERVICES="$SERVICE_NAME $WORKER_SERVICE_NAME $LONG_WORKER_SERVICE_NAME $SCHEDULER_SERVICE_NAME"
+fi
+if [ -n "${STABLE_SERVICES// /}" ]; then
+    aws ecs wait services-stable \
+        --cluster "$CLUSTER_NAME" \
+        --services $STABLE_SERVICES \
+        --region "$REGION"
+fi
 
 echo -e "${GREEN}✅ ECS service is stable${NC}"
 echo ""
@@ -198,11 +253,9 @@ echo ""
 # Deploy frontend
 echo "🌐 Frontend deployment:"
 echo ""
-echo "1. Build frontend:"
-echo "   npm run build"
-echo ""
-echo "2. Upload to S3:"
-echo "   aws s3 sync dist/ s3://$S3_BUCKET --delete"
+echo "Build and publish from the repository root (API is served from the CloudFront domain under /api;"
+echo "only changed files are uploaded and only index.html and changed unhashed paths are invalidated):"
+echo "   VITE_API_URL=https://$CLOUDFRONT_URL/api PULUMI_STACK=$PULUMI_STACK ./scripts/deploy-frontend.sh"
 echo ""
 
 # Summary
@@ -213,7 +266,7 @@ echo "━━━━━━━━━━━━━━━━━━━━━━━━
 echo ""
 echo "📊 Deployment Summary:"
 echo ""
-echo "  Backend API:  http://$ALB_DNS"
+echo "  Backend API:  https://$CLOUDFRONT_URL/api (origin: http://$ALB_DNS)"
 echo "  CloudFront:   https://$CLOUDFRONT_URL"
 echo "  RDS:          $RDS_ENDPOINT"
 echo "  ECR:          $ECR_URL"
@@ -7,13 +7,67 @@ import pulumi
 import pulumi_aws as aws
 
 
+# TLS 1.3 with TLS 1.2 fallback for older clients; no TLS 1.0/1.1
+DEFAULT_SSL_POLICY = "ELBSecurityPolicy-TLS13-1-2-2021-06"
+
+# Web target group; override per stack with the `target_group` config object
+DEFAULT_TARGET_GROUP = {
+    # Route to the task with the fewest in-flight requests, so slow AI/LLM calls don't pile up on one task
+    "load_balancing_algorithm": "least_outstanding_requests",
+    # Seconds to ramp a new target's share of traffic; ALB only supports it with round_robin
+    "slow_start": 0,
+    # Matches the ECS default stopTimeout (30s): in-flight requests finish before the task is killed
+    "deregistration_delay": 30,
+    "health_check_path": "/health",
+    "health_check_interval": 10,
+    "health_check_timeout": 5,
+    "healthy_threshold": 2,
+    "unhealthy_threshold": 3,
+    "stickiness": False,
+    "stickiness_duration": 3600,
+}
+
+
+def target_group_settings(overrides: dict = None) -> dict:
+    """Merge stack config overrides on top of the default target group settings"""
+    settings = {**DEFAULT_TARGET_GROUP, **(overrides or {})}
+    
+    if settings["slow_start"] and settings["load_balancing_algorithm"] != "round_robin":
+        raise ValueError(
+            "target_group slow_start requires load_balancing_algorithm 'round_robin', "
+            f"got '{settings['load_balancing_algorithm']}'"
+        )
+    
+    return settings
+
+
 def create_alb(
     project_name: str,
     environment: str,
     vpc_id: pulumi.Input[str],
     public_subnets: list,
+    certificate_arn: pulumi.Input[str] = None,
+    ssl_policy: str = DEFAULT_SSL_POLICY,
+    target_group: dict = None,
+    blue_green: dict = None,
 ):
-    """Create Application Load Balancer for ECS service"""
+    """
+    Create Application Load Balancer for ECS service
+    
+    With certificate_arn, traffic is served on 443 (HTTP/2 over TLS) and port 80
+    only redirects to HTTPS; without it, port 80 forwards to the target group.
+    
+    With blue_green (blue_green_settings()), a second (green) target group and a test
+    listener are added for CodeDeploy, which then owns both listeners' forward actions.
+    
+    Returns:
+        Tuple of (alb, target group, security group, blue/green targets or None), where the
+        blue/green targets are a dict of green_target_group, production_listener and test_listener
+    """
+    
+    test_listener_port = None
+    if blue_green:
+        test_listener_port = blue_green["test_listener_port"] or (8443 if certificate_arn else 8080)
     
     # Create security group for ALB
     alb_sg = aws.ec2.SecurityGroup(
@@ -35,6 +89,13 @@ def create_alb(
                 protocol="tcp",
                 cidr_blocks=["0.0.0.0/0"],
             ),
+            *([aws.ec2.SecurityGroupIngressArgs(
+                description="Blue/green test listener",
+                from_port=test_listener_port,
+                to_port=test_listener_port,
+                protocol="tcp",
+                cidr_blocks=blue_green["test_listener_cidrs"],
+            )] if blue_green and blue_green["test_listener_cidrs"] else []),
         ],
         egress=[
             aws.ec2.SecurityGroupEgressArgs(
@@ -50,29 +111,44 @@ def create_alb(
         },
     )
     
-    # Create target group
-    target_group = aws.lb.TargetGroup(
-        f"{project_name}-tg",
-        name=f"{project_name}-tg",
-        port=80,
-        protocol="HTTP",
-        vpc_id=vpc_id,
-        target_type="ip",
-        health_check=aws.lb.TargetGroupHealthCheckArgs(
-            enabled=True,
-            healthy_threshold=2,
-            unhealthy_threshold=3,
-            timeout=5,
-            interval=30,
-            path="/health",
+    tg_settings = target_group_settings(target_group)
+    
+    def web_target_group(name: str):
+        return aws.lb.TargetGroup(
+            name,
+            name=name,
+            port=80,
             protocol="HTTP",
-            matcher="200",
-        ),
-        tags={
-            "Name": f"{project_name}-tg",
-            "Environment": environment,
-        },
-    )
+            vpc_id=vpc_id,
+            target_type="ip",
+            load_balancing_algorithm_type=tg_settings["load_balancing_algorithm"],
+            slow_start=tg_settings["slow_start"],
+            deregistration_delay=tg_settings["deregistration_delay"],
+            health_check=aws.lb.TargetGroupHealthCheckArgs(
+                enabled=True,
+                healthy_threshold=tg_settings["healthy_threshold"],
+                unhealthy_threshold=tg_settings["unhealthy_threshold"],
+                timeout=tg_settings["health_check_timeout"],
+                interval=tg_settings["health_check_interval"],
+                path=tg_settings["health_check_path"],
+                protocol="HTTP",
+                matcher="200",
+            ),
+            stickiness=aws.lb.TargetGroupStickinessArgs(
+                enabled=tg_settings["stickiness"],
+                type="lb_cookie",
+                cookie_duration=tg_settings["stickiness_duration"],
+            ),
+            tags={
+                "Name": name,
+                "Environment": environment,
+            },
+        )
+    
+    # Create target group
+    target_group = web_target_group(f"{project_name}-tg")
+    # CodeDeploy starts each release's tasks in whichever group is idle
+    green_target_group = web_target_group(f"{project_name}-tg-green") if blue_green else None
     
     # Create load balancer
     alb = aws.lb.LoadBalancer(
@@ -90,28 +166,76 @@ def create_alb(
         },
     )
     
-    # Create HTTP listener (forward to target group)
+    def forward_to(group: aws.lb.TargetGroup):
+        return aws.lb.ListenerDefaultActionArgs(
+            type="forward",
+            forward=aws.lb.ListenerDefaultActionForwardArgs(
+                target_groups=[
+                    aws.lb.ListenerDefaultActionForwardTargetGroupArgs(
+                        arn=group.arn,
+                    ),
+                ],
+            ),
+        )
+    
+    forward_to_target_group = forward_to(target_group)
+    # CodeDeploy repoints the forward actions on every deployment; don't revert them
+    codedeploy_owned = pulumi.ResourceOptions(ignore_changes=["default_actions"]) if blue_green else None
+    
+    if certificate_arn:
+        # Create HTTPS listener (forward to target group)
+        production_listener = aws.lb.Listener(
+            f"{project_name}-https-listener",
+            load_balancer_arn=alb.arn,
+            port=443,
+            protocol="HTTPS",
+            ssl_policy=ssl_policy,
+            certificate_arn=certificate_arn,
+            default_actions=[forward_to_target_group],
+            opts=codedeploy_owned,
+        )
+        
+        http_action = aws.lb.ListenerDefaultActionArgs(
+            type="redirect",
+            redirect=aws.lb.ListenerDefaultActionRedirectArgs(
+                protocol="HTTPS",
+                port="443",
+                status_code="HTTP_301",
+            ),
+        )
+    else:
+        http_action = forward_to_target_group
+    
+    # Create HTTP listener (redirect to HTTPS, or forward when there is no certificate)
     # Note: If listener already exists, it will be updated in-place
     http_listener = aws.lb.Listener(
         f"{project_name}-http-listener",
         load_balancer_arn=alb.arn,
         port=80,
         protocol="HTTP",
-        default_actions=[
-            aws.lb.ListenerDefaultActionArgs(
-                type="forward",
-                forward=aws.lb.ListenerDefaultActionForwardArgs(
-                    target_groups=[
-                        aws.lb.ListenerDefaultActionForwardTargetGroupArgs(
-                            arn=target_group.arn,
-                        ),
-                    ],
-                ),
-            ),
-        ],
+        default_actions=[http_action],
+        opts=codedeploy_owned if not certificate_arn else None,
     )
+    if not certificate_arn:
+        production_listener = http_listener
     
-    # Note: HTTPS listener would require ACM certificate
-    # For production, add HTTPS listener with ACM certificate
+    blue_green_targets = None
+    if blue_green:
+        # Reaches the replacement tasks before (and while) production traffic shifts to them
+        test_listener = aws.lb.Listener(
+            f"{project_name}-test-listener",
+            load_balancer_arn=alb.arn,
+            port=test_listener_port,
+            protocol="HTTPS" if certificate_arn else "HTTP",
+            ssl_policy=ssl_policy if certificate_arn else None,
+            certificate_arn=certificate_arn,
+            default_actions=[forward_to(green_target_group)],
+            opts=codedeploy_owned,
+        )
+        blue_green_targets = {
+            "green_target_group": green_target_group,
+            "production_listener": production_listener,
+            "test_listener": test_listener,
+        }
     
-    return alb, target_group, alb_sg
+    return alb, target_group, alb_sg, blue_green_targets
@@ -0,0 +1,170 @@
+"""
+ECS Service Auto Scaling
+Creates Application Auto Scaling target, target-tracking policies and scheduled actions for ECS services
+"""
+
+import pulumi
+import pulumi_aws as aws
+
+
+# Defaults for the web service; override per stack with the `autoscaling` config object
+DEFAULT_AUTOSCALING = {
+    "enabled": True,
+    "min_capacity": 1,
+    "max_capacity": 4,
+    "cpu_target": 60,
+    "memory_target": 75,
+    "requests_per_target": 500,  # ALB RequestCountPerTarget per minute, None disables
+    "scale_in_cooldown": 300,
+    "scale_out_cooldown": 60,
+    "scheduled_actions": [],
+}
+
+
+def autoscaling_settings(overrides: dict = None, defaults: dict = None) -> dict:
+    """Merge stack config overrides on top of the default autoscaling settings"""
+    settings = dict(defaults or DEFAULT_AUTOSCALING)
+    settings.update(overrides or {})
+
+    if settings["min_capacity"] > settings["max_capacity"]:
+        raise ValueError(
+            f"autoscaling min_capacity ({settings['min_capacity']}) "
+            f"exceeds max_capacity ({settings['max_capacity']})"
+        )
+
+    return settings
+
+
+def request_count_resource_label(
+    alb_arn_suffix: pulumi.Input[str],
+    target_group_arn_suffix: pulumi.Input[str],
+) -> pulumi.Output[str]:
+    """Build the ALBRequestCountPerTarget resource label from the ALB and target group ARN suffixes"""
+    return pulumi.Output.concat(alb_arn_suffix, "/", target_group_arn_suffix)
+
+
+def create_service_autoscaling(
+    name_prefix: str,
+    environment: str,
+    cluster_name: pulumi.Input[str],
+    service_name: pulumi.Input[str],
+    settings: dict,
+    request_count_resource_label: pulumi.Input[str] = None,
+    custom_metrics: list = None,
+    opts: pulumi.ResourceOptions = None,
+):
+    """
+    Create Application Auto Scaling for an ECS service
+
+    Args:
+        name_prefix: Prefix for resource names (e.g. "learning-center-web")
+        environment: Environment name
+        cluster_name: ECS cluster name
+        service_name: ECS service name
+        settings: Merged settings from autoscaling_settings()
+        request_count_resource_label: "<alb arn suffix>/<target group arn suffix>" from
+            request_count_resource_label(), enables the ALBRequestCountPerTarget policy when set
+        custom_metrics: Extra target-tracking policies on CloudWatch metrics, each a dict
+            with name, metric_name, namespace, statistic, target and optional dimensions
+        opts: Resource options (e.g. depends_on the service)
+
+    Returns:
+        Tuple of (scalable target, dict of scaling policies by name)
+    """
+    target = aws.appautoscaling.Target(
+        f"{name_prefix}-scaling-target",
+        service_namespace="ecs",
+        scalable_dimension="ecs:service:DesiredCount",
+        resource_id=pulumi.Output.all(cluster_name, service_name).apply(
+            lambda args: f"service/{args[0]}/{args[1]}"
+        ),
+        min_capacity=settings["min_capacity"],
+        max_capacity=settings["max_capacity"],
+        tags={
+            "Name": f"{name_prefix}-scaling-target",
+            "Environment": environment,
+        },
+        opts=opts,
+    )
+
+    def target_tracking_policy(policy_name, target_value, **metric):
+        return aws.appautoscaling.Policy(
+            f"{name_prefix}-{policy_name}-scaling",
+            name=f"{name_prefix}-{policy_name}-scaling",
+            policy_type="TargetTrackingScaling",
+            resource_id=target.resource_id,
+            scalable_dimension=target.scalable_dimension,
+            service_namespace=target.service_namespace,
+            target_tracking_scaling_policy_configuration=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationArgs(
+                target_value=target_value,
+                scale_in_cooldown=settings["scale_in_cooldown"],
+                scale_out_cooldown=settings["scale_out_cooldown"],
+                **metric,
+            ),
+        )
+
+    policies = {}
+
+    if settings.get("cpu_target"):
+        policies["cpu"] = target_tracking_policy(
+            "cpu",
+            settings["cpu_target"],
+            predefined_metric_specification=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(
+                predefined_metric_type="ECSServiceAverageCPUUtilization",
+            ),
+        )
+
+    if settings.get("memory_target"):
+        policies["memory"] = target_tracking_policy(
+            "memory",
+            settings["memory_target"],
+            predefined_metric_specification=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(
+                predefined_metric_type="ECSServiceAverageMemoryUtilization",
+            ),
+        )
+
+    if settings.get("requests_per_target") and request_count_resource_label is not None:
+        policies["requests"] = target_tracking_policy(
+            "requests",
+            settings["requests_per_target"],
+            predefined_metric_specification=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(
+                predefined_metric_type="ALBRequestCountPerTarget",
+                resource_label=request_count_resource_label,
+            ),
+        )
+
+    for metric in custom_metrics or []:
+        policies[metric["name"]] = target_tracking_policy(
+            metric["name"],
+            metric["target"],
+            customized_metric_specification=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationCustomizedMetricSpecificationArgs(
+                metric_name=metric["metric_name"],
+                namespace=metric["namespace"],
+                statistic=metric.get("statistic", "Average"),
+                dimensions=[
+                    aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationCustomizedMetricSpecificationDimensionArgs(
+                        name=name,
+                        value=value,
+                    )
+                    for name, value in (metric.get("dimensions") or {}).items()
+                ],
+            ),
+        )
+
+    # Scheduled scale-ups (e.g. raise the floor ahead of weekday business hours)
+    for action in settings.get("scheduled_actions") or []:
+        aws.appautoscaling.ScheduledAction(
+            f"{name_prefix}-{action['name']}",
+            name=f"{name_prefix}-{action['name']}",
+            resource_id=target.resource_id,
+            scalable_dimension=target.scalable_dimension,
+            service_namespace=target.service_namespace,
+            schedule=action["schedule"],
+            timezone=action.get("timezone", "UTC"),
+            scalable_target_action=aws.appautoscaling.ScheduledActionScalableTargetActionArgs(
+                min_capacity=action.get("min_capacity"),
+                max_capacity=action.get("max_capacity"),
+            ),
+        )
+
+    return target, policies
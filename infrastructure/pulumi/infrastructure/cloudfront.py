@@ -1,18 +1,171 @@
 """
-CloudFront Distribution for Frontend
-Creates CloudFront distribution for S3 frontend bucket
+CloudFront Distributions for Frontend and Assets
+Creates CloudFront distributions for the S3 frontend and assets buckets
 """
 
+import json
+
 import pulumi
 import pulumi_aws as aws
 
 
+ONE_YEAR = 31536000
+
+# Vite writes content-hashed bundles under /assets, so they can be cached forever
+IMMUTABLE_PATHS = ["/assets/*"]
+
+# Publish state (scripts/publish_frontend.py manifest) kept in the frontend bucket but never served
+PUBLISH_STATE_PREFIX = "_publish/"
+
+# SPA routing: extensionless paths (client-side routes) are served index.html. Done at the
+# viewer-request stage instead of with 403/404 custom error responses, which would also
+# rewrite genuine API errors from the /api/* origin into 200 index.html
+SPA_REWRITE_FUNCTION = """
+function handler(event) {
+    var request = event.request;
+    var lastSegment = request.uri.substring(request.uri.lastIndexOf('/') + 1);
+    if (lastSegment.indexOf('.') === -1) {
+        request.uri = '/index.html';
+    }
+    return request;
+}
+"""
+
+# Laravel API behind the ALB, served from the frontend's hostname; override with the `cloudfront` config object
+DEFAULT_CLOUDFRONT = {
+    "api_path_pattern": "/api/*",
+    "api_max_ttl": 300,  # ceiling for endpoints that opt in with Cache-Control: public, max-age=N
+    "api_keepalive_timeout": 55,  # below the ALB's 60s idle timeout so CloudFront never reuses a closed connection
+    "api_read_timeout": 60,
+    # Extra caching layer in front of the S3 origin, so regional edge cache misses collapse
+    # into one fetch; set to the bucket's region (e.g. us-east-1), None disables
+    "origin_shield_region": None,
+}
+
+# Course media and TTS audio in the assets bucket; override with the `assets_cdn` config object
+DEFAULT_ASSETS_CDN = {
+    "default_ttl": 86400,
+    "max_ttl": ONE_YEAR,
+    "cors_allowed_origins": ["*"],
+    # PEM public key for signed URLs; when set every path except public_paths needs a signature
+    "signing_public_key": None,
+    "public_paths": [],
+}
+
+
+def _cache_policy(name: str, comment: str, default_ttl: int, max_ttl: int, min_ttl: int = 0):
+    """Cache policy keyed on the path only (no cookies, headers or query strings), compressed variants cached"""
+    return aws.cloudfront.CachePolicy(
+        name,
+        name=name,
+        comment=comment,
+        min_ttl=min_ttl,
+        default_ttl=default_ttl,
+        max_ttl=max_ttl,
+        parameters_in_cache_key_and_forwarded_to_origin=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginArgs(
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+            cookies_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginCookiesConfigArgs(
+                cookie_behavior="none",
+            ),
+            headers_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginHeadersConfigArgs(
+                header_behavior="none",
+            ),
+            query_strings_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginQueryStringsConfigArgs(
+                query_string_behavior="none",
+            ),
+        ),
+    )
+
+
+def _cache_control_headers_policy(name: str, comment: str, cache_control: str):
+    """Response headers policy that sets the browser-facing Cache-Control, overriding the origin's"""
+    return aws.cloudfront.ResponseHeadersPolicy(
+        name,
+        name=name,
+        comment=comment,
+        custom_headers_config=aws.cloudfront.ResponseHeadersPolicyCustomHeadersConfigArgs(
+            items=[
+                aws.cloudfront.ResponseHeadersPolicyCustomHeadersConfigItemArgs(
+                    header="Cache-Control",
+                    value=cache_control,
+                    override=True,
+                ),
+            ],
+        ),
+    )
+
+
+def _create_api_policies(project_name: str, settings: dict):
+    """Cache and origin request policies for the /api/* behavior"""
+    # TTL 0 by default: only responses that send Cache-Control max-age are cached.
+    # Authorization can only reach the origin via the cache key, which also keeps cached responses per-token
+    cache_policy = aws.cloudfront.CachePolicy(
+        f"{project_name}-api",
+        name=f"{project_name}-api",
+        comment="Laravel API, cached only when the response opts in",
+        min_ttl=0,
+        default_ttl=0,
+        max_ttl=settings["api_max_ttl"],
+        parameters_in_cache_key_and_forwarded_to_origin=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginArgs(
+            enable_accept_encoding_gzip=True,
+            enable_accept_encoding_brotli=True,
+            cookies_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginCookiesConfigArgs(
+                cookie_behavior="none",
+            ),
+            headers_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginHeadersConfigArgs(
+                header_behavior="whitelist",
+                headers=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginHeadersConfigHeadersArgs(
+                    items=["Authorization"],
+                ),
+            ),
+            query_strings_config=aws.cloudfront.CachePolicyParametersInCacheKeyAndForwardedToOriginQueryStringsConfigArgs(
+                query_string_behavior="all",
+            ),
+        ),
+    )
+    
+    # Everything else the app reads (Accept, Content-Type, X-XSRF-TOKEN, session cookies)
+    # goes to the origin without fragmenting the cache. Host is left out: CloudFront then sends
+    # the origin domain, which is what the ALB certificate is checked against over HTTPS
+    origin_request_policy = aws.cloudfront.OriginRequestPolicy(
+        f"{project_name}-api",
+        name=f"{project_name}-api",
+        comment="Forward viewer headers except Host, cookies and query strings to the Laravel API",
+        cookies_config=aws.cloudfront.OriginRequestPolicyCookiesConfigArgs(
+            cookie_behavior="all",
+        ),
+        headers_config=aws.cloudfront.OriginRequestPolicyHeadersConfigArgs(
+            header_behavior="allExcept",
+            headers=aws.cloudfront.OriginRequestPolicyHeadersConfigHeadersArgs(
+                items=["Host"],
+            ),
+        ),
+        query_strings_config=aws.cloudfront.OriginRequestPolicyQueryStringsConfigArgs(
+            query_string_behavior="all",
+        ),
+    )
+    
+    return cache_policy, origin_request_policy
+
+
 def create_cloudfront(
     project_name: str,
     environment: str,
     s3_bucket: aws.s3.Bucket,
+    alb: aws.lb.LoadBalancer = None,
+    alb_origin_domain: pulumi.Input[str] = None,
+    settings: dict = None,
 ):
-    """Create CloudFront distribution for frontend S3 bucket"""
+    """
+    Create CloudFront distribution for frontend S3 bucket
+    
+    When alb is given, /api/* is routed to it so the SPA and API share one hostname
+    and one TLS connection. alb_origin_domain is the name on the ALB's certificate;
+    when set CloudFront connects over HTTPS, otherwise over plain HTTP to the ALB DNS name.
+    """
+    
+    cdn_settings = {**DEFAULT_CLOUDFRONT, **(settings or {})}
     
     # Get account ID for OAC
     current = aws.get_caller_identity()
@@ -47,12 +200,96 @@ def create_cloudfront(
                                 "AWS:SourceArn": "arn:aws:cloudfront::{args[2]}:distribution/*"
                             }}
                         }}
+                    }},
+                    {{
+                        "Effect": "Deny",
+                        "Principal": {{
+                            "Service": "cloudfront.amazonaws.com"
+                        }},
+                        "Action": "s3:GetObject",
+                        "Resource": "{args[1]}/{PUBLISH_STATE_PREFIX}*"
                     }}
                 ]
             }}"""
         ),
     )
     
+    # Hashed bundles: a year at the edge and in the browser
+    immutable_cache_policy = _cache_policy(
+        f"{project_name}-immutable-assets",
+        comment="Content-hashed frontend assets",
+        default_ttl=ONE_YEAR,
+        max_ttl=ONE_YEAR,
+    )
+    immutable_headers_policy = _cache_control_headers_policy(
+        f"{project_name}-immutable-assets-headers",
+        comment="Cache-Control for content-hashed frontend assets",
+        cache_control=f"public, max-age={ONE_YEAR}, immutable",
+    )
+    
+    # Everything else is index.html (root, /index.html, SPA deep links) or small public files:
+    # TTL 0 so the edge revalidates with S3 (ETag) on every request and never serves a stale entry point
+    no_cache_policy = _cache_policy(
+        f"{project_name}-no-cache-html",
+        comment="Frontend entry points, revalidated on every request",
+        default_ttl=0,
+        max_ttl=ONE_YEAR,
+    )
+    no_cache_headers_policy = _cache_control_headers_policy(
+        f"{project_name}-no-cache-html-headers",
+        comment="Cache-Control for frontend entry points",
+        cache_control="no-cache",
+    )
+    
+    spa_rewrite = aws.cloudfront.Function(
+        f"{project_name}-spa-rewrite",
+        name=f"{project_name}-spa-rewrite",
+        runtime="cloudfront-js-2.0",
+        comment="Serve index.html for client-side routes",
+        publish=True,
+        code=SPA_REWRITE_FUNCTION,
+    )
+    
+    origins = [
+        aws.cloudfront.DistributionOriginArgs(
+            domain_name=s3_bucket.bucket_domain_name,
+            origin_id=s3_bucket.id,
+            origin_access_control_id=oac.id,
+            origin_shield=aws.cloudfront.DistributionOriginOriginShieldArgs(
+                enabled=True,
+                origin_shield_region=cdn_settings["origin_shield_region"],
+            ) if cdn_settings["origin_shield_region"] else None,
+        ),
+    ]
+    api_behaviors = []
+    
+    if alb is not None:
+        api_cache_policy, api_origin_request_policy = _create_api_policies(project_name, cdn_settings)
+        api_origin_id = f"{project_name}-alb"
+        
+        origins.append(aws.cloudfront.DistributionOriginArgs(
+            domain_name=alb_origin_domain or alb.dns_name,
+            origin_id=api_origin_id,
+            custom_origin_config=aws.cloudfront.DistributionOriginCustomOriginConfigArgs(
+                http_port=80,
+                https_port=443,
+                origin_protocol_policy="https-only" if alb_origin_domain else "http-only",
+                origin_ssl_protocols=["TLSv1.2"],
+                origin_keepalive_timeout=cdn_settings["api_keepalive_timeout"],
+                origin_read_timeout=cdn_settings["api_read_timeout"],
+            ),
+        ))
+        api_behaviors.append(aws.cloudfront.DistributionOrderedCacheBehaviorArgs(
+            path_pattern=cdn_settings["api_path_pattern"],
+            allowed_methods=["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"],
+            cached_methods=["GET", "HEAD"],
+            target_origin_id=api_origin_id,
+            compress=True,
+            viewer_protocol_policy="redirect-to-https",
+            cache_policy_id=api_cache_policy.id,
+            origin_request_policy_id=api_origin_request_policy.id,
+        ))
+    
     # Create CloudFront distribution
     distribution = aws.cloudfront.Distribution(
         f"{project_name}-cf",
@@ -61,13 +298,7 @@ def create_cloudfront(
         comment=f"CloudFront distribution for {project_name}",
         default_root_object="index.html",
         
-        origins=[
-            aws.cloudfront.DistributionOriginArgs(
-                domain_name=s3_bucket.bucket_domain_name,
-                origin_id=s3_bucket.id,
-                origin_access_control_id=oac.id,
-            ),
-        ],
+        origins=origins,
         
         default_cache_behavior=aws.cloudfront.DistributionDefaultCacheBehaviorArgs(
             allowed_methods=["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"],
@@ -75,31 +306,28 @@ def create_cloudfront(
             target_origin_id=s3_bucket.id,
             compress=True,
             viewer_protocol_policy="redirect-to-https",
-            min_ttl=0,
-            default_ttl=3600,
-            max_ttl=86400,
-            forwarded_values=aws.cloudfront.DistributionDefaultCacheBehaviorForwardedValuesArgs(
-                query_string=False,
-                cookies=aws.cloudfront.DistributionDefaultCacheBehaviorForwardedValuesCookiesArgs(
-                    forward="none",
+            cache_policy_id=no_cache_policy.id,
+            response_headers_policy_id=no_cache_headers_policy.id,
+            function_associations=[
+                aws.cloudfront.DistributionDefaultCacheBehaviorFunctionAssociationArgs(
+                    event_type="viewer-request",
+                    function_arn=spa_rewrite.arn,
                 ),
-            ),
+            ],
         ),
         
-        # Custom error responses for SPA routing
-        custom_error_responses=[
-            aws.cloudfront.DistributionCustomErrorResponseArgs(
-                error_code=404,
-                response_code=200,
-                response_page_path="/index.html",
-                error_caching_min_ttl=300,
-            ),
-            aws.cloudfront.DistributionCustomErrorResponseArgs(
-                error_code=403,
-                response_code=200,
-                response_page_path="/index.html",
-                error_caching_min_ttl=300,
-            ),
+        ordered_cache_behaviors=api_behaviors + [
+            aws.cloudfront.DistributionOrderedCacheBehaviorArgs(
+                path_pattern=path_pattern,
+                allowed_methods=["GET", "HEAD"],
+                cached_methods=["GET", "HEAD"],
+                target_origin_id=s3_bucket.id,
+                compress=True,
+                viewer_protocol_policy="redirect-to-https",
+                cache_policy_id=immutable_cache_policy.id,
+                response_headers_policy_id=immutable_headers_policy.id,
+            )
+            for path_pattern in IMMUTABLE_PATHS
         ],
         
         restrictions=aws.cloudfront.DistributionRestrictionsArgs(
@@ -119,3 +347,147 @@ def create_cloudfront(
     )
     
     return distribution
+
+
+def create_assets_cloudfront(
+    project_name: str,
+    environment: str,
+    s3_bucket: aws.s3.Bucket,
+    settings: dict = None,
+):
+    """
+    Create CloudFront distribution for the assets S3 bucket (course media, TTS audio)
+
+    Returns:
+        Tuple of (distribution, signing public key or None); the public key's id is the
+        Key-Pair-Id the backend puts in signed URLs
+    """
+    
+    cdn_settings = {**DEFAULT_ASSETS_CDN, **(settings or {})}
+    
+    oac = aws.cloudfront.OriginAccessControl(
+        f"{project_name}-assets-oac",
+        name=f"{project_name}-assets-oac",
+        description=f"OAC for {project_name} assets",
+        origin_access_control_origin_type="s3",
+        signing_behavior="always",
+        signing_protocol="sigv4",
+    )
+    
+    # Range requests are served from the edge cache without putting Range in the cache key,
+    # so seeking in audio/video reuses the one cached object. Signed URL query strings stay out of it too
+    cache_policy = _cache_policy(
+        f"{project_name}-assets-media",
+        comment="Assets bucket media",
+        default_ttl=cdn_settings["default_ttl"],
+        max_ttl=cdn_settings["max_ttl"],
+    )
+    
+    # <audio>/<video> elements on the frontend read ranges cross-origin
+    cors_headers_policy = aws.cloudfront.ResponseHeadersPolicy(
+        f"{project_name}-assets-cors",
+        name=f"{project_name}-assets-cors",
+        comment="CORS for media played from the frontend",
+        cors_config=aws.cloudfront.ResponseHeadersPolicyCorsConfigArgs(
+            access_control_allow_credentials=False,
+            access_control_allow_headers=aws.cloudfront.ResponseHeadersPolicyCorsConfigAccessControlAllowHeadersArgs(
+                items=["Range"],
+            ),
+            access_control_allow_methods=aws.cloudfront.ResponseHeadersPolicyCorsConfigAccessControlAllowMethodsArgs(
+                items=["GET", "HEAD", "OPTIONS"],
+            ),
+            access_control_allow_origins=aws.cloudfront.ResponseHeadersPolicyCorsConfigAccessControlAllowOriginsArgs(
+                items=cdn_settings["cors_allowed_origins"],
+            ),
+            access_control_expose_headers=aws.cloudfront.ResponseHeadersPolicyCorsConfigAccessControlExposeHeadersArgs(
+                items=["Accept-Ranges", "Content-Length", "Content-Range"],
+            ),
+            access_control_max_age_sec=86400,
+            origin_override=True,
+        ),
+    )
+    
+    public_key = None
+    trusted_key_groups = None
+    if cdn_settings["signing_public_key"]:
+        public_key = aws.cloudfront.PublicKey(
+            f"{project_name}-assets-signing-key",
+            name=f"{project_name}-assets-signing-key",
+            comment=f"Signed URL key for {project_name} assets",
+            encoded_key=cdn_settings["signing_public_key"],
+        )
+        key_group = aws.cloudfront.KeyGroup(
+            f"{project_name}-assets-key-group",
+            name=f"{project_name}-assets-key-group",
+            comment=f"Signed URL signers for {project_name} assets",
+            items=[public_key.id],
+        )
+        trusted_key_groups = [key_group.id]
+    
+    def media_behavior(args_class, signed, **kwargs):
+        return args_class(
+            allowed_methods=["GET", "HEAD", "OPTIONS"],
+            cached_methods=["GET", "HEAD"],
+            target_origin_id=s3_bucket.id,
+            compress=False,  # audio/video are already compressed
+            viewer_protocol_policy="redirect-to-https",
+            cache_policy_id=cache_policy.id,
+            response_headers_policy_id=cors_headers_policy.id,
+            trusted_key_groups=trusted_key_groups if signed else None,
+            **kwargs,
+        )
+    
+    distribution = aws.cloudfront.Distribution(
+        f"{project_name}-assets-cf",
+        enabled=True,
+        is_ipv6_enabled=True,
+        comment=f"CloudFront distribution for {project_name} assets",
+        origins=[
+            aws.cloudfront.DistributionOriginArgs(
+                domain_name=s3_bucket.bucket_regional_domain_name,
+                origin_id=s3_bucket.id,
+                origin_access_control_id=oac.id,
+            ),
+        ],
+        default_cache_behavior=media_behavior(aws.cloudfront.DistributionDefaultCacheBehaviorArgs, signed=True),
+        ordered_cache_behaviors=[
+            media_behavior(aws.cloudfront.DistributionOrderedCacheBehaviorArgs, signed=False, path_pattern=path)
+            for path in cdn_settings["public_paths"]
+        ],
+        restrictions=aws.cloudfront.DistributionRestrictionsArgs(
+            geo_restriction=aws.cloudfront.DistributionRestrictionsGeoRestrictionArgs(
+                restriction_type="none",
+            ),
+        ),
+        viewer_certificate=aws.cloudfront.DistributionViewerCertificateArgs(
+            cloudfront_default_certificate=True,
+        ),
+        tags={
+            "Name": f"{project_name}-assets-cf",
+            "Environment": environment,
+        },
+    )
+    
+    # Only this distribution may read the bucket
+    aws.s3.BucketPolicy(
+        f"{project_name}-assets-policy",
+        bucket=s3_bucket.id,
+        policy=pulumi.Output.all(s3_bucket.arn, distribution.arn).apply(
+            lambda args: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Principal": {"Service": "cloudfront.amazonaws.com"},
+                        "Action": "s3:GetObject",
+                        "Resource": f"{args[0]}/*",
+                        "Condition": {
+                            "StringEquals": {"AWS:SourceArn": args[1]},
+                        },
+                    },
+                ],
+            })
+        ),
+    )
+    
+    return distribution, public_key
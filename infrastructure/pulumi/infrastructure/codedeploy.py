@@ -0,0 +1,298 @@
+"""
+CodeDeploy Blue/Green for the Web Service
+Creates the CodeDeploy application, canary/linear traffic-shift configs, rollback alarms and the
+deployment group that moves the ECS web service between two ALB target groups
+"""
+
+import pulumi
+import pulumi_aws as aws
+import json
+
+
+# Web service deployment controllers for the `deployment_controller` config: ECS rolling
+# updates (default) or CodeDeploy blue/green
+DEPLOYMENT_CONTROLLERS = ("ECS", "CODE_DEPLOY")
+
+TRAFFIC_SHIFTS = ("canary", "linear", "all_at_once")
+
+# Blue/green settings; override per stack with the `blue_green` config object
+#   traffic_shift:            shift the deployment group uses by default; all three configs exist, so a
+#                             single release can pick another with `--deployment-config-name`
+#   canary_percentage/canary_interval:  traffic moved first, and minutes before the rest follows
+#   linear_percentage/linear_interval:  traffic moved per step, and minutes between steps
+#   approval_timeout:         minutes to hold the replacement tasks on the test listener until
+#                             `aws deploy continue-deployment` (0 = shift as soon as they are healthy)
+#   termination_wait:         minutes the old tasks keep running after the shift, for an instant rollback
+#   test_listener_port:       ALB port that routes to the replacement tasks; None = 8443 with a certificate, 8080 without
+#   test_listener_cidrs:      CIDRs allowed to reach the test listener (none by default)
+#   p99_latency_threshold:    seconds of ALB p99 TargetResponseTime that rolls a deployment back
+#   target_5xx_threshold:     5xx responses per minute from the tasks that roll a deployment back
+#   elb_5xx_threshold:        5xx responses per minute from the ALB itself (502/503/504) that roll a deployment back
+#   alarm_evaluation_periods: consecutive breaching minutes before an alarm fires
+DEFAULT_BLUE_GREEN = {
+    "traffic_shift": "canary",
+    "canary_percentage": 10,
+    "canary_interval": 5,
+    "linear_percentage": 20,
+    "linear_interval": 2,
+    "approval_timeout": 0,
+    "termination_wait": 5,
+    "test_listener_port": None,
+    "test_listener_cidrs": [],
+    # AI/LLM endpoints are slow by nature; this catches regressions, not the usual tail
+    "p99_latency_threshold": 5,
+    "target_5xx_threshold": 10,
+    "elb_5xx_threshold": 10,
+    "alarm_evaluation_periods": 2,
+}
+
+
+def blue_green_settings(overrides: dict = None) -> dict:
+    """Merge stack `blue_green` overrides on top of the defaults"""
+    settings = {**DEFAULT_BLUE_GREEN, **(overrides or {})}
+
+    if settings["traffic_shift"] not in TRAFFIC_SHIFTS:
+        raise ValueError(
+            f"blue_green traffic_shift must be one of {', '.join(TRAFFIC_SHIFTS)}, got {settings['traffic_shift']!r}"
+        )
+    for key in ("canary_percentage", "linear_percentage"):
+        if not 1 <= settings[key] <= 99:
+            raise ValueError(f"blue_green {key} must be 1-99, got {settings[key]}")
+
+    return settings
+
+
+def _web_appspec(task_definition_arn: str, container_port: int, capacity: dict) -> str:
+    """AppSpec for one web deployment: the task definition to roll out and where the ALB sends traffic"""
+    strategy = [{"CapacityProvider": "FARGATE", "Base": capacity["on_demand_base"], "Weight": capacity["on_demand_weight"]}]
+    if capacity["spot_weight"] > 0:
+        strategy.append({"CapacityProvider": "FARGATE_SPOT", "Weight": capacity["spot_weight"]})
+
+    return json.dumps({
+        "version": 0.0,
+        "Resources": [{
+            "TargetService": {
+                "Type": "AWS::ECS::Service",
+                "Properties": {
+                    "TaskDefinition": task_definition_arn,
+                    "LoadBalancerInfo": {
+                        "ContainerName": "laravel",
+                        "ContainerPort": container_port,
+                    },
+                    "CapacityProviderStrategy": strategy,
+                },
+            },
+        }],
+    })
+
+
+def create_blue_green_deployment(
+    project_name: str,
+    environment: str,
+    cluster_name: pulumi.Input[str],
+    service_name: pulumi.Input[str],
+    alb_arn_suffix: pulumi.Input[str],
+    target_group_names: list,
+    production_listener_arn: pulumi.Input[str],
+    test_listener_arn: pulumi.Input[str],
+    task_definition_arn: pulumi.Input[str],
+    container_port: int,
+    capacity: dict,
+    settings: dict,
+):
+    """
+    Create CodeDeploy blue/green deployments for the web service
+
+    Each deployment starts a replacement task set behind the idle target group (reachable on the
+    test listener), shifts production traffic to it by the configured canary/linear steps, and
+    rolls back automatically if the ALB's p99 latency or 5xx alarms fire before it completes.
+
+    Args:
+        project_name: Project name for resource names
+        environment: Environment name
+        cluster_name: ECS cluster name
+        service_name: Web service name (deployment_controller CODE_DEPLOY)
+        alb_arn_suffix: ALB ARN suffix for the alarm dimensions
+        target_group_names: [blue, green] target group names
+        production_listener_arn: Listener serving production traffic
+        test_listener_arn: Listener that always routes to the replacement tasks
+        task_definition_arn: Web task definition each deployment rolls out
+        container_port: Web container port
+        capacity: Web entry of capacity_provider_settings()
+        settings: Merged settings from blue_green_settings()
+
+    Returns:
+        Tuple of (application, deployment group, revision JSON for `aws deploy create-deployment --revision`)
+    """
+
+    codedeploy_role = aws.iam.Role(
+        f"{project_name}-codedeploy-role",
+        assume_role_policy=json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Action": "sts:AssumeRole",
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "codedeploy.amazonaws.com",
+                },
+            }],
+        }),
+        tags={
+            "Name": f"{project_name}-codedeploy-role",
+            "Environment": environment,
+        },
+    )
+
+    codedeploy_policy = aws.iam.RolePolicyAttachment(
+        f"{project_name}-codedeploy-policy",
+        role=codedeploy_role.name,
+        policy_arn="arn:aws:iam::aws:policy/AWSCodeDeployRoleForECS",
+    )
+
+    application = aws.codedeploy.Application(
+        f"{project_name}-web-app",
+        name=f"{project_name}-web",
+        compute_platform="ECS",
+        tags={
+            "Name": f"{project_name}-web-app",
+            "Environment": environment,
+        },
+    )
+
+    canary_config = aws.codedeploy.DeploymentConfig(
+        f"{project_name}-canary-config",
+        deployment_config_name=(
+            f"{project_name}-canary-{settings['canary_percentage']}pct-{settings['canary_interval']}min"
+        ),
+        compute_platform="ECS",
+        traffic_routing_config=aws.codedeploy.DeploymentConfigTrafficRoutingConfigArgs(
+            type="TimeBasedCanary",
+            time_based_canary=aws.codedeploy.DeploymentConfigTrafficRoutingConfigTimeBasedCanaryArgs(
+                percentage=settings["canary_percentage"],
+                interval=settings["canary_interval"],
+            ),
+        ),
+    )
+
+    linear_config = aws.codedeploy.DeploymentConfig(
+        f"{project_name}-linear-config",
+        deployment_config_name=(
+            f"{project_name}-linear-{settings['linear_percentage']}pct-{settings['linear_interval']}min"
+        ),
+        compute_platform="ECS",
+        traffic_routing_config=aws.codedeploy.DeploymentConfigTrafficRoutingConfigArgs(
+            type="TimeBasedLinear",
+            time_based_linear=aws.codedeploy.DeploymentConfigTrafficRoutingConfigTimeBasedLinearArgs(
+                percentage=settings["linear_percentage"],
+                interval=settings["linear_interval"],
+            ),
+        ),
+    )
+
+    deployment_config_names = {
+        "canary": canary_config.deployment_config_name,
+        "linear": linear_config.deployment_config_name,
+        "all_at_once": "CodeDeployDefault.ECSAllAtOnce",
+    }
+
+    # Alarms watch the whole ALB rather than one target group: the groups swap roles on every
+    # deployment, and a regression on either side of a partial shift should stop it
+    alarms = [
+        aws.cloudwatch.MetricAlarm(
+            f"{project_name}-web-{name}",
+            name=f"{project_name}-web-{name}",
+            alarm_description=description,
+            namespace="AWS/ApplicationELB",
+            metric_name=metric_name,
+            dimensions={"LoadBalancer": alb_arn_suffix},
+            period=60,
+            evaluation_periods=settings["alarm_evaluation_periods"],
+            comparison_operator="GreaterThanThreshold",
+            threshold=threshold,
+            # No requests or no errors publish no datapoints
+            treat_missing_data="notBreaching",
+            **statistic,
+            tags={
+                "Name": f"{project_name}-web-{name}",
+                "Environment": environment,
+            },
+        )
+        for name, description, metric_name, statistic, threshold in (
+            ("p99-latency", "Web p99 response time; rolls back blue/green deployments",
+             "TargetResponseTime", {"extended_statistic": "p99"}, settings["p99_latency_threshold"]),
+            ("target-5xx", "Web task 5xx responses; rolls back blue/green deployments",
+             "HTTPCode_Target_5XX_Count", {"statistic": "Sum"}, settings["target_5xx_threshold"]),
+            ("elb-5xx", "ALB 5xx responses (no healthy target, timeouts); rolls back blue/green deployments",
+             "HTTPCode_ELB_5XX_Count", {"statistic": "Sum"}, settings["elb_5xx_threshold"]),
+        )
+    ]
+
+    if settings["approval_timeout"]:
+        # Hold traffic on the blue tasks until someone runs `aws deploy continue-deployment`
+        ready_option = aws.codedeploy.DeploymentGroupBlueGreenDeploymentConfigDeploymentReadyOptionArgs(
+            action_on_timeout="STOP_DEPLOYMENT",
+            wait_time_in_minutes=settings["approval_timeout"],
+        )
+    else:
+        ready_option = aws.codedeploy.DeploymentGroupBlueGreenDeploymentConfigDeploymentReadyOptionArgs(
+            action_on_timeout="CONTINUE_DEPLOYMENT",
+        )
+
+    deployment_group = aws.codedeploy.DeploymentGroup(
+        f"{project_name}-web-deployment-group",
+        app_name=application.name,
+        deployment_group_name=f"{project_name}-web",
+        service_role_arn=codedeploy_role.arn,
+        deployment_config_name=deployment_config_names[settings["traffic_shift"]],
+        deployment_style=aws.codedeploy.DeploymentGroupDeploymentStyleArgs(
+            deployment_option="WITH_TRAFFIC_CONTROL",
+            deployment_type="BLUE_GREEN",
+        ),
+        blue_green_deployment_config=aws.codedeploy.DeploymentGroupBlueGreenDeploymentConfigArgs(
+            deployment_ready_option=ready_option,
+            terminate_blue_instances_on_deployment_success=aws.codedeploy.DeploymentGroupBlueGreenDeploymentConfigTerminateBlueInstancesOnDeploymentSuccessArgs(
+                action="TERMINATE",
+                termination_wait_time_in_minutes=settings["termination_wait"],
+            ),
+        ),
+        ecs_service=aws.codedeploy.DeploymentGroupEcsServiceArgs(
+            cluster_name=cluster_name,
+            service_name=service_name,
+        ),
+        load_balancer_info=aws.codedeploy.DeploymentGroupLoadBalancerInfoArgs(
+            target_group_pair_info=aws.codedeploy.DeploymentGroupLoadBalancerInfoTargetGroupPairInfoArgs(
+                prod_traffic_route=aws.codedeploy.DeploymentGroupLoadBalancerInfoTargetGroupPairInfoProdTrafficRouteArgs(
+                    listener_arns=[production_listener_arn],
+                ),
+                test_traffic_route=aws.codedeploy.DeploymentGroupLoadBalancerInfoTargetGroupPairInfoTestTrafficRouteArgs(
+                    listener_arns=[test_listener_arn],
+                ),
+                target_groups=[
+                    aws.codedeploy.DeploymentGroupLoadBalancerInfoTargetGroupPairInfoTargetGroupArgs(name=name)
+                    for name in target_group_names
+                ],
+            ),
+        ),
+        auto_rollback_configuration=aws.codedeploy.DeploymentGroupAutoRollbackConfigurationArgs(
+            enabled=True,
+            events=["DEPLOYMENT_FAILURE", "DEPLOYMENT_STOP_ON_ALARM"],
+        ),
+        alarm_configuration=aws.codedeploy.DeploymentGroupAlarmConfigurationArgs(
+            enabled=True,
+            alarms=[alarm.name for alarm in alarms],
+        ),
+        tags={
+            "Name": f"{project_name}-web-deployment-group",
+            "Environment": environment,
+        },
+        opts=pulumi.ResourceOptions(depends_on=[codedeploy_policy]),
+    )
+
+    revision = pulumi.Output.from_input(task_definition_arn).apply(
+        lambda arn: json.dumps({
+            "revisionType": "AppSpecContent",
+            "appSpecContent": {"content": _web_appspec(arn, container_port, capacity)},
+        })
+    )
+
+    return application, deployment_group, revision
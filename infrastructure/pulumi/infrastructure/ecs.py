@@ -1,11 +1,329 @@
 """
 ECS Fargate Cluster for Laravel Backend
-Creates ECS cluster, task definition, and service for Laravel application
+Creates ECS cluster, task definitions, and services for the Laravel web tier, Horizon queue workers,
+the scheduler and batch jobs
 """
 
 import pulumi
 import pulumi_aws as aws
 import json
+import math
+import shlex
+from infrastructure.autoscaling import autoscaling_settings, create_service_autoscaling
+from infrastructure.codedeploy import DEPLOYMENT_CONTROLLERS
+
+
+# Horizon queue workers; override per stack with the `worker` config object
+DEFAULT_WORKER = {
+    "enabled": True,
+    "cpu": "1024",
+    "memory": "2048",
+    "min_capacity": 1,
+    "max_capacity": 6,
+    "cpu_target": None,
+    "memory_target": None,
+    "requests_per_target": None,
+    "queue_depth_target": 100,  # Pending jobs across all Horizon queues
+    "metrics_namespace": "LearningCenter/Queues",
+    "metrics_interval": 60,
+    # Alarm when PendingJobs stops arriving for this many minutes (the sidecar died or can't reach
+    # Redis), since scale-out then silently stops; alarm_actions are e.g. SNS topic ARNs
+    "metrics_missing_minutes": 5,
+    "alarm_actions": [],
+    "scale_in_cooldown": 300,
+    "scale_out_cooldown": 60,
+    "scheduled_actions": [],
+}
+
+# Horizon's `<environment>-long` supervisors (config/horizon.php): queues whose jobs outlive the
+# 120s Fargate stop timeout. A fixed count of on-demand tasks that is never scaled in or put on
+# Spot, so only deploys interrupt them; override with the `long_worker` config object
+DEFAULT_LONG_WORKER = {
+    "enabled": True,
+    "cpu": "1024",
+    "memory": "2048",
+    "count": 1,
+}
+
+# Single `schedule:work` task; override with the `scheduler` config object
+DEFAULT_SCHEDULER = {
+    "enabled": True,
+    "cpu": "256",
+    "memory": "512",
+}
+
+# FARGATE / FARGATE_SPOT split per service; override with the `capacity_providers` config object
+#   on_demand_base:   tasks that always run on FARGATE before the weights apply
+#   on_demand_weight: share of tasks beyond the base on FARGATE
+#   spot_weight:      share of tasks beyond the base on FARGATE_SPOT (2-minute interruption notice)
+DEFAULT_CAPACITY_PROVIDERS = {
+    "web": {"on_demand_base": 1, "on_demand_weight": 1, "spot_weight": 1},
+    # Horizon finishes or releases in-flight jobs on SIGTERM, so workers tolerate interruptions
+    "worker": {"on_demand_base": 1, "on_demand_weight": 0, "spot_weight": 1},
+}
+
+# php-fpm/OPcache settings for the web container; override with the `php_runtime` config object.
+# The image sizes the static php-fpm pool from the task's memory and vCPUs unless fpm_max_children is set
+DEFAULT_PHP_RUNTIME = {
+    "fpm_max_children": None,
+    "fpm_child_memory_mb": 64,
+    "opcache_jit": "disable",  # or "tracing" / "function"
+}
+
+# Web tier runtimes for the `runtime_mode` config. fpm is the default image (nginx + php-fpm);
+# octane runs the `:octane` image (Dockerfile target `octane`) under RoadRunner, booting Laravel
+# once per worker. Override octane settings with the `octane` config object
+RUNTIME_MODES = ("fpm", "octane")
+
+DEFAULT_OCTANE = {
+    "port": 8000,
+    "workers_per_vcpu": 8,  # Workers block on Postgres, Redis and AI APIs, so run several per vCPU
+    "max_requests": 500,  # Recycle each worker after this many requests to contain memory leaks
+}
+
+# Rolling deploys of the web service; override with the `deployment` config object
+#   minimum_healthy_percent/maximum_percent: start the replacement tasks before stopping the old ones
+#   health_check_grace_period:   seconds ECS ignores failing ALB health checks after a task starts
+#   circuit_breaker:             stop a deployment whose tasks never turn healthy and roll back to the last good one
+#   health_check_*:              `laravel` container health check on /health (ECS-side, alongside the ALB check)
+#   warmup:                      sidecar that sends warmup_requests to each of warmup_paths before the
+#                                container reports healthy, so the first user requests hit a warm OPcache
+DEFAULT_DEPLOYMENT = {
+    "minimum_healthy_percent": 100,
+    "maximum_percent": 200,
+    "health_check_grace_period": 60,
+    "circuit_breaker": True,
+    "health_check_interval": 15,
+    "health_check_timeout": 5,
+    "health_check_retries": 3,
+    "health_check_start_period": 30,
+    "warmup": False,
+    "warmup_paths": ["/health", "/"],
+    "warmup_requests": 20,
+}
+
+# Task volume the warm-up sidecar drops its marker file into; the web health check waits for it
+WARMUP_VOLUME = "warmup"
+WARMUP_MARKER = "/run/warmup/done"
+
+# Web task size, shared by the task definition and the Octane worker count
+WEB_TASK_CPU = 512
+WEB_TASK_MEMORY = 1024
+
+# Fargate CPU architectures for the `cpu_architecture` config; ARM64 runs on Graviton and
+# needs an arm64 (or multi-arch) image, which deploy.sh builds by default
+CPU_ARCHITECTURES = ("X86_64", "ARM64")
+
+# Sizing for entries in the `batch_jobs` config list that don't set their own
+DEFAULT_BATCH_JOB = {
+    "cpu": "1024",
+    "memory": "2048",
+}
+
+
+def _laravel_environment(
+    environment: str,
+    db_host: str,
+    db_read_host,
+    redis_host: str,
+    redis_port,
+    redis_cluster_workloads: tuple = (),
+    redis_cache_host: str = None,
+    redis_session_host: str = None,
+) -> list:
+    """Environment shared by every container that boots the Laravel app"""
+    variables = [
+        {"name": "APP_ENV", "value": environment},
+        {"name": "APP_DEBUG", "value": "false"},
+        {"name": "DB_CONNECTION", "value": "pgsql"},
+        {"name": "DB_HOST", "value": db_host},
+        # Enables Laravel's read/write split (config/database.php)
+        *([{"name": "DB_READ_HOST", "value": db_read_host}] if db_read_host else []),
+        {"name": "REDIS_HOST", "value": redis_host},
+        {"name": "REDIS_PORT", "value": str(redis_port)},
+        {"name": "CACHE_DRIVER", "value": "redis"},
+        {"name": "CACHE_STORE", "value": "redis"},  # Laravel 11+ name for CACHE_DRIVER
+        {"name": "QUEUE_CONNECTION", "value": "redis"},
+        {"name": "SESSION_DRIVER", "value": "redis"},
+        {"name": "LOG_CHANNEL", "value": "stderr"},
+    ]
+    
+    # Per-workload replication groups: queues, Horizon and cache locks stay on the
+    # `default` connection (REDIS_HOST, noeviction); cache and sessions move to their own.
+    # A cluster-mode group is reached through its `*-cluster` connection in config/database.php
+    # (redis.clusters), which speaks the cluster protocol
+    if redis_cache_host:
+        variables.append({"name": "REDIS_CACHE_HOST", "value": redis_cache_host})
+        if "cache" in redis_cluster_workloads:
+            variables.append({"name": "REDIS_CACHE_CONNECTION", "value": "cache-cluster"})
+    if redis_session_host:
+        variables += [
+            {"name": "REDIS_SESSION_HOST", "value": redis_session_host},
+            {
+                "name": "SESSION_CONNECTION",
+                "value": "session-cluster" if "session" in redis_cluster_workloads else "session",
+            },
+        ]
+    
+    return variables
+
+
+def capacity_provider_settings(overrides: dict = None, cpu_architecture: str = "X86_64") -> dict:
+    """
+    Merge per-service `capacity_providers` overrides on top of the defaults
+
+    Fargate Spot only runs X86_64 tasks, so with ARM64 the default Spot share moves to FARGATE
+    and an explicit spot_weight is rejected.
+    """
+    settings = {}
+    for service, defaults in DEFAULT_CAPACITY_PROVIDERS.items():
+        service_overrides = (overrides or {}).get(service) or {}
+        settings[service] = {**defaults, **service_overrides}
+        if cpu_architecture.upper() == "ARM64":
+            if service_overrides.get("spot_weight", 0) > 0:
+                raise ValueError(
+                    f"capacity_providers.{service}.spot_weight must be 0 with cpu_architecture ARM64; "
+                    "Fargate Spot doesn't run ARM64 tasks"
+                )
+            settings[service]["spot_weight"] = 0
+            if settings[service]["on_demand_weight"] <= 0:
+                settings[service]["on_demand_weight"] = 1
+        if settings[service]["on_demand_weight"] <= 0 and settings[service]["spot_weight"] <= 0:
+            raise ValueError(f"capacity_providers.{service} needs a positive on_demand_weight or spot_weight")
+    
+    unknown = sorted(set(overrides or {}) - set(DEFAULT_CAPACITY_PROVIDERS))
+    if unknown:
+        raise ValueError(f"Unknown capacity_providers service(s): {', '.join(unknown)}")
+    
+    return settings
+
+
+def _capacity_provider_strategies(settings: dict) -> list:
+    """Service capacity provider strategy for one entry of capacity_provider_settings()"""
+    strategies = [
+        aws.ecs.ServiceCapacityProviderStrategyArgs(
+            capacity_provider="FARGATE",
+            base=settings["on_demand_base"],
+            weight=settings["on_demand_weight"],
+        ),
+    ]
+    if settings["spot_weight"] > 0:
+        strategies.append(aws.ecs.ServiceCapacityProviderStrategyArgs(
+            capacity_provider="FARGATE_SPOT",
+            weight=settings["spot_weight"],
+        ))
+    return strategies
+
+
+def web_container_port(runtime_mode: str = "fpm", octane: dict = None) -> int:
+    """Port the web container listens on (ALB target and ALB-to-ECS security group rule)"""
+    if runtime_mode not in RUNTIME_MODES:
+        raise ValueError(f"runtime_mode must be one of {', '.join(RUNTIME_MODES)}, got {runtime_mode!r}")
+    if runtime_mode == "octane":
+        return {**DEFAULT_OCTANE, **(octane or {})}["port"]
+    return 80
+
+
+def deployment_settings(overrides: dict = None) -> dict:
+    """Merge stack `deployment` overrides on top of the defaults"""
+    settings = {**DEFAULT_DEPLOYMENT, **(overrides or {})}
+    
+    if not 0 <= settings["minimum_healthy_percent"] <= 100:
+        raise ValueError(f"deployment minimum_healthy_percent must be 0-100, got {settings['minimum_healthy_percent']}")
+    if settings["maximum_percent"] <= settings["minimum_healthy_percent"] or settings["maximum_percent"] < 100:
+        raise ValueError(
+            "deployment maximum_percent must be at least 100 and above minimum_healthy_percent "
+            f"so a deployment can make progress, got {settings['maximum_percent']}"
+        )
+    if not 0 <= settings["health_check_start_period"] <= 300:
+        raise ValueError(f"deployment health_check_start_period must be 0-300, got {settings['health_check_start_period']}")
+    
+    return settings
+
+
+def _web_health_check(port: int, settings: dict) -> dict:
+    """Container health check for the web container; with warm-up on it also waits for the sidecar's marker"""
+    probe = f"curl -fsS -o /dev/null http://localhost:{port}/health"
+    if settings["warmup"]:
+        probe = f"test -f {WARMUP_MARKER} && {probe}"
+    return {
+        "command": ["CMD-SHELL", f"{probe} || exit 1"],
+        "interval": settings["health_check_interval"],
+        "timeout": settings["health_check_timeout"],
+        "retries": settings["health_check_retries"],
+        "startPeriod": settings["health_check_start_period"],
+    }
+
+
+def _warmup_container(image: str, port: int, settings: dict, log_group_name: str) -> dict:
+    """
+    Non-essential sidecar that primes the web container once it starts
+    
+    It shares the task's network namespace, so it waits for /health on localhost, sends
+    warmup_requests to each path (compiling the app into OPcache and, under Octane, booting every
+    worker) and then writes the marker the web health check waits for. config:cache already ran in
+    the web container's entrypoint. The marker is written even if the app never answers, so a
+    broken image fails on its own health check rather than hanging on the sidecar.
+    """
+    paths = " ".join(shlex.quote(path) for path in settings["warmup_paths"])
+    script = (
+        f"for i in $(seq 1 120); do curl -fs -o /dev/null http://localhost:{port}/health && break; sleep 1; done; "
+        f"for path in {paths}; do for i in $(seq 1 {settings['warmup_requests']}); do "
+        f"curl -s -o /dev/null \"http://localhost:{port}$path\"; done; done; "
+        f"touch {WARMUP_MARKER}"
+    )
+    return {
+        "name": "warmup",
+        "image": image,
+        "essential": False,
+        # Skip the image entrypoint (config:cache, php-fpm sizing); this container only runs curl
+        "entryPoint": ["sh", "-c"],
+        "command": [script],
+        "dependsOn": [{"containerName": "laravel", "condition": "START"}],
+        "mountPoints": [{"sourceVolume": WARMUP_VOLUME, "containerPath": "/run/warmup"}],
+        "logConfiguration": _log_configuration(log_group_name, "warmup"),
+    }
+
+
+def _octane_container_settings(octane: dict) -> dict:
+    """Command for the web container in octane mode"""
+    settings = {**DEFAULT_OCTANE, **(octane or {})}
+    workers = max(1, math.ceil(WEB_TASK_CPU / 1024 * settings["workers_per_vcpu"]))
+    return {
+        "command": [
+            "php", "artisan", "octane:start",
+            "--server=roadrunner",
+            "--host=0.0.0.0",
+            f"--port={settings['port']}",
+            f"--workers={workers}",
+            f"--max-requests={settings['max_requests']}",
+        ],
+    }
+
+
+def _database_secrets(secret_arn: str) -> list:
+    """Database credentials injected from the keys of the `{project}/database/credentials` secret"""
+    return [
+        {"name": name, "valueFrom": f"{secret_arn}:{key}::"}
+        for name, key in (
+            ("DB_PORT", "port"),
+            ("DB_DATABASE", "dbname"),
+            ("DB_USERNAME", "username"),
+            ("DB_PASSWORD", "password"),
+        )
+    ]
+
+
+def _log_configuration(log_group_name: str, stream_prefix: str) -> dict:
+    """awslogs driver configuration for a container"""
+    return {
+        "logDriver": "awslogs",
+        "options": {
+            "awslogs-group": log_group_name,
+            "awslogs-region": aws.config.region,
+            "awslogs-stream-prefix": stream_prefix,
+        },
+    }
 
 
 def create_ecs_cluster(
@@ -18,11 +336,65 @@ def create_ecs_cluster(
     database_secret_arn: pulumi.Input[str],
     redis_endpoint: pulumi.Input[str],
     redis_port: pulumi.Input[int],
+    redis_cluster_workloads: tuple = (),
+    redis_cache_endpoint: pulumi.Input[str] = None,
+    redis_session_endpoint: pulumi.Input[str] = None,
     api_secrets: dict = None,
     target_group_arn: pulumi.Input[str] = None,
+    database_read_url: pulumi.Input[str] = None,
+    request_count_resource_label: pulumi.Input[str] = None,
+    autoscaling: dict = None,
+    worker: dict = None,
+    scheduler: dict = None,
+    long_worker: dict = None,
+    batch_jobs: list = None,
+    image: pulumi.Input[str] = None,
+    cpu_architecture: str = "X86_64",
+    capacity_providers: dict = None,
+    php_runtime: dict = None,
+    runtime_mode: str = "fpm",
+    octane: dict = None,
+    octane_image: pulumi.Input[str] = None,
+    deployment: dict = None,
+    deployment_controller: str = "ECS",
 ):
     """Create ECS Fargate cluster for Laravel backend"""
     
+    deployment_controller = deployment_controller.upper()
+    if deployment_controller not in DEPLOYMENT_CONTROLLERS:
+        raise ValueError(
+            f"deployment_controller must be one of {', '.join(DEPLOYMENT_CONTROLLERS)}, got {deployment_controller!r}"
+        )
+    rolling = deployment_controller == "ECS"
+    
+    cpu_architecture = cpu_architecture.upper()
+    if cpu_architecture not in CPU_ARCHITECTURES:
+        raise ValueError(f"cpu_architecture must be one of {', '.join(CPU_ARCHITECTURES)}, got {cpu_architecture!r}")
+    runtime_platform = aws.ecs.TaskDefinitionRuntimePlatformArgs(
+        operating_system_family="LINUX",
+        cpu_architecture=cpu_architecture,
+    )
+    
+    scaling = autoscaling_settings(autoscaling)
+    worker_settings = autoscaling_settings(worker, defaults=DEFAULT_WORKER)
+    scheduler_settings = {**DEFAULT_SCHEDULER, **(scheduler or {})}
+    long_worker_settings = {**DEFAULT_LONG_WORKER, **(long_worker or {})}
+    capacity_settings = capacity_provider_settings(capacity_providers, cpu_architecture)
+    container_port = web_container_port(runtime_mode, octane)
+    octane_container = _octane_container_settings(octane) if runtime_mode == "octane" else {}
+    deploy_settings = deployment_settings(deployment)
+    web_health_check = _web_health_check(container_port, deploy_settings)
+    php_settings = {**DEFAULT_PHP_RUNTIME, **(php_runtime or {})}
+    php_environment = [
+        {"name": name, "value": str(php_settings[key])}
+        for name, key in (
+            ("PHP_FPM_MAX_CHILDREN", "fpm_max_children"),
+            ("PHP_FPM_CHILD_MEMORY_MB", "fpm_child_memory_mb"),
+            ("PHP_OPCACHE_JIT", "opcache_jit"),
+        )
+        if php_settings[key] is not None
+    ]
+    
     # Create ECS cluster
     cluster = aws.ecs.Cluster(
         f"{project_name}-cluster",
@@ -39,6 +411,19 @@ def create_ecs_cluster(
         },
     )
     
+    # Services pick their own FARGATE/FARGATE_SPOT split; run-task and schedules default to FARGATE
+    cluster_capacity_providers = aws.ecs.ClusterCapacityProviders(
+        f"{project_name}-capacity-providers",
+        cluster_name=cluster.name,
+        capacity_providers=["FARGATE", "FARGATE_SPOT"],
+        default_capacity_provider_strategies=[
+            aws.ecs.ClusterCapacityProvidersDefaultCapacityProviderStrategyArgs(
+                capacity_provider="FARGATE",
+                weight=1,
+            ),
+        ],
+    )
+    
     # Create IAM role for ECS tasks
     task_role = aws.iam.Role(
         f"{project_name}-ecs-task-role",
@@ -80,6 +465,17 @@ def create_ecs_cluster(
                     ],
                     "Resource": "*",
                 },
+                {
+                    # Horizon workers publish queue depth for autoscaling
+                    "Effect": "Allow",
+                    "Action": "cloudwatch:PutMetricData",
+                    "Resource": "*",
+                    "Condition": {
+                        "StringEquals": {
+                            "cloudwatch:namespace": worker_settings["metrics_namespace"],
+                        },
+                    },
+                },
             ],
         }),
     )
@@ -142,9 +538,10 @@ def create_ecs_cluster(
         },
     )
     
-    # Get ECR repository (assuming it exists or will be created separately)
-    # For now, we'll use a placeholder image
-    image = f"{project_name}-backend:latest"
+    # Backend image from the ECR repository; placeholder when none is passed
+    image = image or f"{project_name}-backend:latest"
+    # Octane mode swaps only the web container; workers, scheduler and batch jobs keep the fpm image
+    web_image = (octane_image or f"{project_name}-backend:octane") if runtime_mode == "octane" else image
     
     # Create task definition
     task_definition = aws.ecs.TaskDefinition(
@@ -152,73 +549,46 @@ def create_ecs_cluster(
         family=f"{project_name}-task",
         network_mode="awsvpc",
         requires_compatibilities=["FARGATE"],
-        cpu="512",
-        memory="1024",
+        cpu=str(WEB_TASK_CPU),
+        memory=str(WEB_TASK_MEMORY),
+        runtime_platform=runtime_platform,
         execution_role_arn=execution_role.arn,
         task_role_arn=task_role.arn,
+        volumes=[aws.ecs.TaskDefinitionVolumeArgs(name=WARMUP_VOLUME)] if deploy_settings["warmup"] else None,
         container_definitions = pulumi.Output.all(
             database_url,
             database_secret_arn,
             redis_endpoint,
             redis_port,
             log_group.name,
+            database_read_url,
+            redis_cache_endpoint,
+            redis_session_endpoint,
+            web_image,
         ).apply(
             lambda args: json.dumps([
                 {
                     "name": "laravel",
-                    "image": image,
+                    "image": args[8],
                     "essential": True,
+                    **octane_container,
+                    "healthCheck": web_health_check,
+                    **({
+                        "mountPoints": [{"sourceVolume": WARMUP_VOLUME, "containerPath": "/run/warmup"}],
+                    } if deploy_settings["warmup"] else {}),
                     "portMappings": [
                         {
-                            "containerPort": 80,
+                            "containerPort": container_port,
                             "protocol": "tcp",
                         },
                     ],
-                    "environment": [
-                        {"name": "APP_ENV", "value": environment},
-                        {"name": "APP_DEBUG", "value": "false"},
-                        {"name": "REDIS_HOST", "value": args[2]},
-                        {"name": "REDIS_PORT", "value": str(args[3])},
-                        {"name": "CACHE_DRIVER", "value": "redis"},
-                        {"name": "QUEUE_CONNECTION", "value": "redis"},
-                        {"name": "SESSION_DRIVER", "value": "redis"},
-                        {"name": "LOG_CHANNEL", "value": "stderr"},
-                    ],
-                    "secrets": [
-                        {
-                            "name": "DB_CONNECTION",
-                            "valueFrom": f"{args[1]}:DB_CONNECTION::",
-                        },
-                        {
-                            "name": "DB_HOST",
-                            "valueFrom": f"{args[1]}:DB_HOST::",
-                        },
-                        {
-                            "name": "DB_PORT",
-                            "valueFrom": f"{args[1]}:DB_PORT::",
-                        },
-                        {
-                            "name": "DB_DATABASE",
-                            "valueFrom": f"{args[1]}:DB_DATABASE::",
-                        },
-                        {
-                            "name": "DB_USERNAME",
-                            "valueFrom": f"{args[1]}:DB_USERNAME::",
-                        },
-                        {
-                            "name": "DB_PASSWORD",
-                            "valueFrom": f"{args[1]}:DB_PASSWORD::",
-                        },
-                    ],
-                    "logConfiguration": {
-                        "logDriver": "awslogs",
-                        "options": {
-                            "awslogs-group": args[4],
-                            "awslogs-region": aws.config.region,
-                            "awslogs-stream-prefix": "ecs",
-                        },
-                    },
+                    "environment": _laravel_environment(
+                        environment, args[0], args[5], args[2], args[3], redis_cluster_workloads, args[6], args[7],
+                    ) + php_environment,
+                    "secrets": _database_secrets(args[1]),
+                    "logConfiguration": _log_configuration(args[4], "ecs"),
                 },
+                *([_warmup_container(args[8], container_port, deploy_settings, args[4])] if deploy_settings["warmup"] else []),
             ])
         ),
         tags={
@@ -236,7 +606,7 @@ def create_ecs_cluster(
         load_balancer_config = [aws.ecs.ServiceLoadBalancerArgs(
             target_group_arn=target_group_arn,
             container_name="laravel",
-            container_port=80,
+            container_port=container_port,
         )]
     
     service = aws.ecs.Service(
@@ -244,8 +614,20 @@ def create_ecs_cluster(
         name=f"{project_name}-service",
         cluster=cluster.arn,
         task_definition=task_definition.arn,
-        desired_count=1,
-        launch_type="FARGATE",
+        desired_count=scaling["min_capacity"] if scaling["enabled"] else 1,
+        capacity_provider_strategies=_capacity_provider_strategies(capacity_settings["web"]),
+        deployment_controller=aws.ecs.ServiceDeploymentControllerArgs(type=deployment_controller),
+        # Strategy changes only apply through a new deployment (made by CodeDeploy under blue/green)
+        force_new_deployment=True if rolling else None,
+        deployment_minimum_healthy_percent=deploy_settings["minimum_healthy_percent"],
+        deployment_maximum_percent=deploy_settings["maximum_percent"],
+        # Blue/green rolls back through the CodeDeploy alarms instead
+        deployment_circuit_breaker=aws.ecs.ServiceDeploymentCircuitBreakerArgs(
+            enable=deploy_settings["circuit_breaker"],
+            rollback=deploy_settings["circuit_breaker"],
+        ) if rolling else None,
+        # Only valid with a load balancer; covers boot, config:cache and warm-up before ALB checks count
+        health_check_grace_period_seconds=deploy_settings["health_check_grace_period"] if target_group_arn else None,
         network_configuration=aws.ecs.ServiceNetworkConfigurationArgs(
             assign_public_ip=False,
             subnets=[s.id for s in private_subnets],
@@ -256,6 +638,505 @@ def create_ecs_cluster(
             "Name": f"{project_name}-service",
             "Environment": environment,
         },
+        # Application Auto Scaling owns the task count once enabled; CodeDeploy owns the
+        # task definition and target group under blue/green
+        opts=pulumi.ResourceOptions(
+            ignore_changes=(
+                (["desired_count"] if scaling["enabled"] else [])
+                + ([] if rolling else ["task_definition", "load_balancers"])
+            ) or None,
+            depends_on=[cluster_capacity_providers],
+        ),
+    )
+    
+    # Scale the web tier on CPU, memory and ALB requests per target
+    if scaling["enabled"]:
+        create_service_autoscaling(
+            name_prefix=f"{project_name}-web",
+            environment=environment,
+            cluster_name=cluster.name,
+            service_name=service.name,
+            settings=scaling,
+            request_count_resource_label=request_count_resource_label if target_group_arn else None,
+            opts=pulumi.ResourceOptions(depends_on=[service]),
+        )
+    
+    # Everything a non-web Laravel task needs to boot the same image
+    task_context = {
+        "image": image,
+        "runtime_platform": runtime_platform,
+        "execution_role": execution_role,
+        "task_role": task_role,
+        "log_group": log_group,
+        "database_host": database_url,
+        "database_read_host": database_read_url,
+        "database_secret_arn": database_secret_arn,
+        "redis_endpoint": redis_endpoint,
+        "redis_port": redis_port,
+        "redis_cluster_workloads": redis_cluster_workloads,
+        "redis_cache_endpoint": redis_cache_endpoint,
+        "redis_session_endpoint": redis_session_endpoint,
+        "subnets": [s.id for s in private_subnets],
+        "security_groups": [ecs_sg.id],
+        "cluster_capacity_providers": cluster_capacity_providers,
+        "circuit_breaker": deploy_settings["circuit_breaker"],
+    }
+    
+    if "queue" in redis_cluster_workloads and worker_settings["enabled"]:
+        # Horizon and the queue Lua scripts use the non-cluster `default` connection
+        raise ValueError(
+            "Horizon workers can't run against a cluster-mode Redis group; keep the queue "
+            "workload single or replicated and use cluster mode for cache/session only"
+        )
+    
+    worker_service = None
+    if worker_settings["enabled"]:
+        worker_service = _create_worker_service(
+            project_name=project_name,
+            environment=environment,
+            settings=worker_settings,
+            capacity=capacity_settings["worker"],
+            cluster=cluster,
+            task_context=task_context,
+        )
+    
+    long_worker_service = None
+    if long_worker_settings["enabled"]:
+        long_worker_service = _create_long_worker_service(
+            project_name=project_name,
+            environment=environment,
+            settings=long_worker_settings,
+            cluster=cluster,
+            task_context=task_context,
+        )
+    
+    # Exactly one scheduler task, so `schedule:run` never fires per web task
+    scheduler_service = None
+    if scheduler_settings["enabled"]:
+        scheduler_service = _create_scheduler_service(
+            project_name=project_name,
+            environment=environment,
+            settings=scheduler_settings,
+            cluster=cluster,
+            task_context=task_context,
+        )
+    
+    if batch_jobs:
+        _create_batch_jobs(
+            project_name=project_name,
+            environment=environment,
+            jobs=batch_jobs,
+            cluster=cluster,
+            task_context=task_context,
+        )
+    
+    return cluster, service, task_definition, ecs_sg, worker_service, long_worker_service, scheduler_service
+
+
+def _artisan_task_definition(
+    resource_name: str,
+    environment: str,
+    cpu: str,
+    memory: str,
+    task_context: dict,
+    containers: list,
+):
+    """
+    Create a Fargate task definition whose containers run artisan commands from the backend image
+    
+    Each entry in containers is a dict with name, command and optional essential,
+    stop_timeout and extra environment.
+    """
+    
+    def container_definitions(args):
+        (db_host, db_read_host, secret_arn, redis_host, redis_port, log_group_name, redis_cache_host,
+         redis_session_host, image) = args
+        return json.dumps([
+            {
+                "name": container["name"],
+                "image": image,
+                "essential": container.get("essential", True),
+                "command": container["command"],
+                **({"stopTimeout": container["stop_timeout"]} if container.get("stop_timeout") else {}),
+                "environment": _laravel_environment(
+                    environment, db_host, db_read_host, redis_host, redis_port, task_context["redis_cluster_workloads"],
+                    redis_cache_host, redis_session_host,
+                ) + container.get("environment", []),
+                "secrets": _database_secrets(secret_arn),
+                "logConfiguration": _log_configuration(log_group_name, container["name"]),
+            }
+            for container in containers
+        ])
+    
+    return aws.ecs.TaskDefinition(
+        resource_name,
+        family=resource_name,
+        network_mode="awsvpc",
+        requires_compatibilities=["FARGATE"],
+        cpu=str(cpu),
+        memory=str(memory),
+        runtime_platform=task_context["runtime_platform"],
+        execution_role_arn=task_context["execution_role"].arn,
+        task_role_arn=task_context["task_role"].arn,
+        container_definitions=pulumi.Output.all(
+            task_context["database_host"],
+            task_context["database_read_host"],
+            task_context["database_secret_arn"],
+            task_context["redis_endpoint"],
+            task_context["redis_port"],
+            task_context["log_group"].name,
+            task_context["redis_cache_endpoint"],
+            task_context["redis_session_endpoint"],
+            task_context["image"],
+        ).apply(container_definitions),
+        tags={
+            "Name": resource_name,
+            "Environment": environment,
+        },
     )
+
+
+def _create_worker_service(
+    project_name: str,
+    environment: str,
+    settings: dict,
+    capacity: dict,
+    cluster: aws.ecs.Cluster,
+    task_context: dict,
+):
+    """Create the Horizon queue-worker task definition and service, scaled on queue depth"""
+    
+    metrics_environment = [
+        {"name": "QUEUE_METRICS_NAMESPACE", "value": settings["metrics_namespace"]},
+        {"name": "QUEUE_METRICS_ENVIRONMENT", "value": environment},
+        {"name": "AWS_DEFAULT_REGION", "value": aws.config.region},
+    ]
+    
+    worker_task_definition = _artisan_task_definition(
+        f"{project_name}-worker-task",
+        environment=environment,
+        cpu=settings["cpu"],
+        memory=settings["memory"],
+        task_context=task_context,
+        containers=[
+            {
+                "name": "horizon",
+                "command": ["php", "artisan", "horizon"],
+                # Let in-flight jobs finish on scale-in and Spot interruption (Fargate maximum);
+                # the `<environment>` supervisors keep their job timeouts below it
+                "stop_timeout": 120,
+                "environment": metrics_environment,
+            },
+            {
+                # Publishes the PendingJobs metric the scaling policy tracks
+                "name": "queue-metrics",
+                "essential": False,
+                "command": [
+                    "php", "artisan", "queue:publish-metrics",
+                    f"--interval={settings['metrics_interval']}",
+                ],
+                "environment": metrics_environment,
+            },
+        ],
+    )
+    
+    worker_service = aws.ecs.Service(
+        f"{project_name}-worker-service",
+        name=f"{project_name}-worker-service",
+        cluster=cluster.arn,
+        task_definition=worker_task_definition.arn,
+        desired_count=settings["min_capacity"],
+        capacity_provider_strategies=_capacity_provider_strategies(capacity),
+        force_new_deployment=True,
+        # Roll back a worker image that crash-loops instead of retrying it forever
+        deployment_circuit_breaker=aws.ecs.ServiceDeploymentCircuitBreakerArgs(
+            enable=task_context["circuit_breaker"],
+            rollback=task_context["circuit_breaker"],
+        ),
+        network_configuration=aws.ecs.ServiceNetworkConfigurationArgs(
+            assign_public_ip=False,
+            subnets=task_context["subnets"],
+            security_groups=task_context["security_groups"],
+        ),
+        tags={
+            "Name": f"{project_name}-worker-service",
+            "Environment": environment,
+        },
+        opts=pulumi.ResourceOptions(
+            ignore_changes=["desired_count"],
+            depends_on=[task_context["cluster_capacity_providers"]],
+        ),
+    )
+    
+    create_service_autoscaling(
+        name_prefix=f"{project_name}-worker",
+        environment=environment,
+        cluster_name=cluster.name,
+        service_name=worker_service.name,
+        settings=settings,
+        custom_metrics=[
+            {
+                "name": "queue-depth",
+                "metric_name": "PendingJobs",
+                "namespace": settings["metrics_namespace"],
+                "statistic": "Average",
+                "target": settings["queue_depth_target"],
+                "dimensions": {"Environment": environment},
+            },
+        ],
+        opts=pulumi.ResourceOptions(depends_on=[worker_service]),
+    )
+    
+    # Target tracking does nothing without datapoints, so a missing metric has to be an alarm of its own.
+    # Periods cover at least one publish interval, or a slower sidecar would look missing
+    metrics_period = 60 * -(-settings["metrics_interval"] // 60)
+    aws.cloudwatch.MetricAlarm(
+        f"{project_name}-worker-queue-metrics-missing",
+        name=f"{project_name}-worker-queue-metrics-missing",
+        alarm_description="No PendingJobs datapoints from the queue-metrics sidecar; worker scale-out is blind",
+        namespace=settings["metrics_namespace"],
+        metric_name="PendingJobs",
+        dimensions={"Environment": environment},
+        statistic="SampleCount",
+        period=metrics_period,
+        evaluation_periods=max(1, -(-settings["metrics_missing_minutes"] * 60 // metrics_period)),
+        comparison_operator="LessThanThreshold",
+        threshold=1,
+        treat_missing_data="breaching",
+        alarm_actions=settings["alarm_actions"],
+        ok_actions=settings["alarm_actions"],
+        tags={
+            "Name": f"{project_name}-worker-queue-metrics-missing",
+            "Environment": environment,
+        },
+    )
+    
+    return worker_service
+
+
+def _create_long_worker_service(
+    project_name: str,
+    environment: str,
+    settings: dict,
+    cluster: aws.ecs.Cluster,
+    task_context: dict,
+):
+    """Create the fixed-size on-demand Horizon service for the long-running `<environment>-long` supervisors"""
+    
+    long_worker_task_definition = _artisan_task_definition(
+        f"{project_name}-long-worker-task",
+        environment=environment,
+        cpu=settings["cpu"],
+        memory=settings["memory"],
+        task_context=task_context,
+        containers=[
+            {
+                "name": "horizon",
+                "command": ["php", "artisan", "horizon", f"--environment={environment}-long"],
+                "stop_timeout": 120,
+            },
+        ],
+    )
+    
+    return aws.ecs.Service(
+        f"{project_name}-long-worker-service",
+        name=f"{project_name}-long-worker-service",
+        cluster=cluster.arn,
+        task_definition=long_worker_task_definition.arn,
+        desired_count=settings["count"],
+        # Never FARGATE_SPOT and no autoscaling: nothing stops these tasks mid-job except a deploy
+        launch_type="FARGATE",
+        deployment_circuit_breaker=aws.ecs.ServiceDeploymentCircuitBreakerArgs(
+            enable=task_context["circuit_breaker"],
+            rollback=task_context["circuit_breaker"],
+        ),
+        network_configuration=aws.ecs.ServiceNetworkConfigurationArgs(
+            assign_public_ip=False,
+            subnets=task_context["subnets"],
+            security_groups=task_context["security_groups"],
+        ),
+        tags={
+            "Name": f"{project_name}-long-worker-service",
+            "Environment": environment,
+        },
+    )
+
+
+def _create_scheduler_service(
+    project_name: str,
+    environment: str,
+    settings: dict,
+    cluster: aws.ecs.Cluster,
+    task_context: dict,
+):
+    """Create a single-task service running the Laravel scheduler"""
+    
+    # schedule:work rather than EventBridge: routes/console.php has sub-minute entries
+    scheduler_task_definition = _artisan_task_definition(
+        f"{project_name}-scheduler-task",
+        environment=environment,
+        cpu=settings["cpu"],
+        memory=settings["memory"],
+        task_context=task_context,
+        containers=[
+            {
+                "name": "scheduler",
+                "command": ["php", "artisan", "schedule:work"],
+            },
+        ],
+    )
+    
+    return aws.ecs.Service(
+        f"{project_name}-scheduler-service",
+        name=f"{project_name}-scheduler-service",
+        cluster=cluster.arn,
+        task_definition=scheduler_task_definition.arn,
+        desired_count=1,
+        launch_type="FARGATE",
+        # Stop the old scheduler before starting the new one so two never overlap
+        deployment_minimum_healthy_percent=0,
+        deployment_maximum_percent=100,
+        deployment_circuit_breaker=aws.ecs.ServiceDeploymentCircuitBreakerArgs(
+            enable=task_context["circuit_breaker"],
+            rollback=task_context["circuit_breaker"],
+        ),
+        network_configuration=aws.ecs.ServiceNetworkConfigurationArgs(
+            assign_public_ip=False,
+            subnets=task_context["subnets"],
+            security_groups=task_context["security_groups"],
+        ),
+        tags={
+            "Name": f"{project_name}-scheduler-service",
+            "Environment": environment,
+        },
+    )
+
+
+def _create_batch_jobs(
+    project_name: str,
+    environment: str,
+    jobs: list,
+    cluster: aws.ecs.Cluster,
+    task_context: dict,
+):
+    """
+    Create separately sized Fargate task definitions for heavy artisan commands
+    
+    Jobs with a `schedule` are launched by EventBridge Scheduler (ECS RunTask);
+    the rest are run on demand with `aws ecs run-task`.
+    
+    Returns:
+        Dict of task definitions by job name
+    """
+    
+    task_definitions = {}
+    for job in jobs:
+        task_definitions[job["name"]] = _artisan_task_definition(
+            f"{project_name}-batch-{job['name']}",
+            environment=environment,
+            cpu=job.get("cpu", DEFAULT_BATCH_JOB["cpu"]),
+            memory=job.get("memory", DEFAULT_BATCH_JOB["memory"]),
+            task_context=task_context,
+            containers=[
+                {
+                    "name": job["name"],
+                    "command": job["command"],
+                },
+            ],
+        )
+    
+    scheduled_jobs = [job for job in jobs if job.get("schedule")]
+    if not scheduled_jobs:
+        return task_definitions
+    
+    # Role EventBridge Scheduler assumes to start the tasks
+    scheduler_role = aws.iam.Role(
+        f"{project_name}-batch-scheduler-role",
+        assume_role_policy=json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Action": "sts:AssumeRole",
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "scheduler.amazonaws.com",
+                },
+            }],
+        }),
+        tags={
+            "Name": f"{project_name}-batch-scheduler-role",
+            "Environment": environment,
+        },
+    )
+    
+    aws.iam.RolePolicy(
+        f"{project_name}-batch-scheduler-policy",
+        role=scheduler_role.id,
+        policy=pulumi.Output.all(
+            cluster.arn,
+            task_context["execution_role"].arn,
+            task_context["task_role"].arn,
+            *[task_definitions[job["name"]].arn_without_revision for job in scheduled_jobs],
+        ).apply(
+            lambda args: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": "ecs:RunTask",
+                        "Resource": [f"{arn}:*" for arn in args[3:]],
+                        "Condition": {
+                            "ArnEquals": {"ecs:cluster": args[0]},
+                        },
+                    },
+                    {
+                        # RunTask with the schedule's `tags` also tags the new task
+                        "Effect": "Allow",
+                        "Action": "ecs:TagResource",
+                        "Resource": "*",
+                        "Condition": {
+                            "StringEquals": {"ecs:CreateAction": "RunTask"},
+                        },
+                    },
+                    {
+                        "Effect": "Allow",
+                        "Action": "iam:PassRole",
+                        "Resource": [args[1], args[2]],
+                    },
+                ],
+            })
+        ),
+    )
+    
+    for job in scheduled_jobs:
+        aws.scheduler.Schedule(
+            f"{project_name}-batch-{job['name']}-schedule",
+            name=f"{project_name}-batch-{job['name']}",
+            schedule_expression=job["schedule"],
+            schedule_expression_timezone=job.get("timezone", "UTC"),
+            flexible_time_window=aws.scheduler.ScheduleFlexibleTimeWindowArgs(
+                mode="OFF",
+            ),
+            target=aws.scheduler.ScheduleTargetArgs(
+                arn=cluster.arn,
+                role_arn=scheduler_role.arn,
+                ecs_parameters=aws.scheduler.ScheduleTargetEcsParametersArgs(
+                    task_definition_arn=task_definitions[job["name"]].arn,
+                    launch_type="FARGATE",
+                    task_count=1,
+                    network_configuration=aws.scheduler.ScheduleTargetEcsParametersNetworkConfigurationArgs(
+                        assign_public_ip=False,
+                        subnets=task_context["subnets"],
+                        security_groups=task_context["security_groups"],
+                    ),
+                    tags={
+                        "Name": f"{project_name}-batch-{job['name']}",
+                        "Environment": environment,
+                    },
+                ),
+                retry_policy=aws.scheduler.ScheduleTargetRetryPolicyArgs(
+                    maximum_retry_attempts=0,
+                ),
+            ),
+        )
     
-    return cluster, service, task_definition, ecs_sg
+    return task_definitions
@@ -0,0 +1,157 @@
+"""
+VPC Endpoints
+Creates S3 gateway and AWS API interface endpoints so private subnets reach AWS services without the NAT gateways
+"""
+
+import pulumi
+import pulumi_aws as aws
+
+
+# Defaults; override per stack with the `vpc_endpoints` config object
+#   s3_gateway:         free gateway endpoint on the route tables (ECR image layers, assets bucket)
+#   interface_services: PrivateLink endpoints (billed per AZ-hour), one security group each;
+#                       `monitoring` carries the Horizon queue-depth metric the worker scales on
+#   skip_existing:      existing VPC only: leave out services another stack already has an endpoint
+#                       for (a second private-DNS interface endpoint for a service fails)
+DEFAULT_VPC_ENDPOINTS = {
+    "s3_gateway": True,
+    "interface_services": ["ecr.api", "ecr.dkr", "secretsmanager", "logs", "ssm", "monitoring"],
+    "skip_existing": True,
+}
+
+# Endpoint states that still occupy the service in the VPC
+ACTIVE_ENDPOINT_STATES = ["pendingAcceptance", "pending", "available", "modifying"]
+
+
+def vpc_endpoint_settings(overrides: dict = None) -> dict:
+    """Merge `vpc_endpoints` config overrides on top of the defaults"""
+    return {**DEFAULT_VPC_ENDPOINTS, **(overrides or {})}
+
+
+def _endpoint_name(project_name: str, service: str) -> str:
+    return f"{project_name}-{service.replace('.', '-')}-endpoint"
+
+
+def _has_vpc_endpoint(vpc_id: str, service: str, tags: dict = None) -> bool:
+    try:
+        endpoint = aws.ec2.get_vpc_endpoint(
+            vpc_id=vpc_id,
+            service_name=f"com.amazonaws.{aws.config.region}.{service}",
+            tags=tags,
+            filters=[
+                aws.ec2.GetVpcEndpointFilterArgs(name="vpc-endpoint-state", values=ACTIVE_ENDPOINT_STATES),
+            ],
+        )
+    except Exception as error:
+        # The data source fails unless exactly one endpoint matches
+        message = str(error).lower()
+        if "no matching" in message:
+            return False
+        if "multiple" in message:
+            return True
+        raise
+    return bool(endpoint.id)
+
+
+def existing_endpoint_services(project_name: str, vpc_id: str, settings: dict) -> list:
+    """
+    Services from `settings` that already have an endpoint in the VPC which this stack didn't create
+
+    Args:
+        project_name: Project name, to recognize this stack's own endpoints by their Name tag
+        vpc_id: VPC to look in
+        settings: Merged settings from vpc_endpoint_settings()
+
+    Returns:
+        Service names ("s3" for the gateway) to pass to create_vpc_endpoints as skip_services
+    """
+    services = (["s3"] if settings["s3_gateway"] else []) + list(settings["interface_services"])
+    return [
+        service
+        for service in services
+        if not _has_vpc_endpoint(vpc_id, service, tags={"Name": _endpoint_name(project_name, service)})
+        and _has_vpc_endpoint(vpc_id, service)
+    ]
+
+
+def create_vpc_endpoints(
+    project_name: str,
+    environment: str,
+    vpc: aws.ec2.Vpc,
+    subnet_ids: list,
+    route_table_ids: list,
+    settings: dict = None,
+    skip_services: list = (),
+) -> dict:
+    """
+    Create VPC endpoints for the AWS APIs ECS tasks call
+
+    Args:
+        project_name: Project name for resource names
+        environment: Environment name
+        vpc: VPC the endpoints live in
+        subnet_ids: Subnets for interface endpoints, at most one per AZ
+        route_table_ids: Route tables that get the S3 gateway route
+        settings: `vpc_endpoints` config overrides
+        skip_services: Services to leave out, e.g. from existing_endpoint_services() ("s3" for the gateway)
+
+    Returns:
+        Dict of service name to endpoint
+    """
+    endpoint_settings = vpc_endpoint_settings(settings)
+    region = aws.config.region
+    endpoints = {}
+
+    if endpoint_settings["s3_gateway"] and "s3" not in skip_services:
+        endpoints["s3"] = aws.ec2.VpcEndpoint(
+            _endpoint_name(project_name, "s3"),
+            vpc_id=vpc.id,
+            service_name=f"com.amazonaws.{region}.s3",
+            vpc_endpoint_type="Gateway",
+            route_table_ids=route_table_ids,
+            tags={
+                "Name": _endpoint_name(project_name, "s3"),
+                "Environment": environment,
+            },
+        )
+
+    for service in endpoint_settings["interface_services"]:
+        if service in skip_services:
+            continue
+        name = _endpoint_name(project_name, service)
+
+        endpoint_sg = aws.ec2.SecurityGroup(
+            f"{name}-sg",
+            description=f"HTTPS from the VPC to the {service} endpoint",
+            vpc_id=vpc.id,
+            ingress=[
+                aws.ec2.SecurityGroupIngressArgs(
+                    description="HTTPS from VPC",
+                    from_port=443,
+                    to_port=443,
+                    protocol="tcp",
+                    cidr_blocks=[vpc.cidr_block],
+                ),
+            ],
+            tags={
+                "Name": f"{name}-sg",
+                "Environment": environment,
+            },
+        )
+
+        # Private DNS makes the regular service hostnames resolve to the endpoint, so SDKs need no changes
+        endpoints[service] = aws.ec2.VpcEndpoint(
+            name,
+            vpc_id=vpc.id,
+            service_name=f"com.amazonaws.{region}.{service}",
+            vpc_endpoint_type="Interface",
+            subnet_ids=subnet_ids,
+            security_group_ids=[endpoint_sg.id],
+            private_dns_enabled=True,
+            tags={
+                "Name": name,
+                "Environment": environment,
+            },
+        )
+
+    return endpoints
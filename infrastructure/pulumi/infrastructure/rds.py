@@ -1,10 +1,109 @@
 """
 RDS PostgreSQL with pgvector Extension
-Creates RDS Aurora PostgreSQL cluster with pgvector support
+Creates RDS Aurora PostgreSQL cluster with pgvector support and an RDS Proxy for connection pooling
 """
 
 import pulumi
 import pulumi_aws as aws
+import json
+
+
+# RDS Proxy settings; override per stack with the `db_proxy` config object
+DEFAULT_DB_PROXY = {
+    "enabled": True,
+    "max_connections_percent": 90,
+    "max_idle_connections_percent": 50,
+    "connection_borrow_timeout": 120,
+    "idle_client_timeout": 1800,
+    "require_tls": False,
+    # Laravel issues SET statements on connect; don't pin sessions for them
+    "session_pinning_filters": ["EXCLUDE_VARIABLE_SETS"],
+}
+
+# Parameter tuning profiles, selected per stack with `db_tuning_profile` (AWS defaults unless a stack
+# opts in: maintenance_work_mem is a fixed size, too large for a small Serverless v2 minimum).
+# Memory values are in kB, durations in ms. Cluster-level values apply to every
+# instance; instance-level values are sized for the instance class.
+DB_TUNING_PROFILES = {
+    "default": {
+        "cluster": {},
+        "instance": {},
+    },
+    # db.t4g.medium-sized: HNSW/IVFFlat builds in memory, slow queries logged
+    "pgvector": {
+        "cluster": {
+            "shared_preload_libraries": "pg_stat_statements",
+            "pg_stat_statements.track": "all",
+            "random_page_cost": "1.1",
+            "effective_io_concurrency": "200",
+            "autovacuum_vacuum_scale_factor": "0.05",
+            "autovacuum_analyze_scale_factor": "0.02",
+            "autovacuum_vacuum_cost_limit": "2000",
+            "autovacuum_naptime": "30",
+            "log_min_duration_statement": "500",
+        },
+        "instance": {
+            "work_mem": "16384",
+            "maintenance_work_mem": "524288",
+            "max_parallel_maintenance_workers": "2",
+        },
+    },
+    # db.r6g.large and up (or Serverless v2 with a high ACU ceiling)
+    "pgvector-large": {
+        "cluster": {
+            "shared_preload_libraries": "pg_stat_statements",
+            "pg_stat_statements.track": "all",
+            "random_page_cost": "1.1",
+            "effective_io_concurrency": "200",
+            "autovacuum_vacuum_scale_factor": "0.02",
+            "autovacuum_analyze_scale_factor": "0.01",
+            "autovacuum_vacuum_cost_limit": "4000",
+            "autovacuum_naptime": "15",
+            "log_min_duration_statement": "250",
+        },
+        "instance": {
+            "work_mem": "65536",
+            "maintenance_work_mem": "2097152",
+            "max_parallel_maintenance_workers": "4",
+        },
+    },
+}
+
+# Static parameters only take effect after a reboot
+STATIC_DB_PARAMETERS = {"shared_preload_libraries"}
+
+# Performance Insights / Enhanced Monitoring; opt in per stack with the `db_monitoring` config object
+DEFAULT_DB_MONITORING = {
+    "performance_insights": False,
+    "performance_insights_retention": 7,  # Days; 7 is the free tier
+    "performance_insights_kms_key_id": None,
+    "monitoring_interval": 0,  # Seconds (1, 5, 10, 15, 30 or 60); 0 disables Enhanced Monitoring
+    "slow_query_metric": False,
+    "slow_query_namespace": "LearningCenter/Database",
+    "log_retention_days": 7,  # postgresql log export group, created with slow_query_metric
+}
+
+# Aurora Serverless v2 ACU range, used when db_capacity_mode is "serverless"
+DEFAULT_DB_SERVERLESS = {
+    "min_capacity": 0.5,
+    "max_capacity": 8,
+}
+
+# Aurora reader instances; override per stack with the `db_readers` config object
+DEFAULT_DB_READERS = {
+    "count": 0,
+    "instance_class": "db.t4g.medium",
+    "promotion_tiers": [],  # Per reader, defaults to 1 (writer is tier 0)
+    "autoscaling": {
+        "enabled": False,
+        "min_capacity": 1,
+        "max_capacity": 3,
+        "cpu_target": 60,
+        "connections_target": None,
+        "scale_in_cooldown": 600,
+        "scale_out_cooldown": 300,
+    },
+}
 
 
 def create_rds(
@@ -14,8 +113,62 @@ def create_rds(
     subnets: list,
     db_subnet_group_name: pulumi.Input[str],
     security_group_tags: dict,
+    db_proxy: dict = None,
+    db_readers: dict = None,
+    db_capacity_mode: str = "provisioned",
+    db_serverless: dict = None,
+    db_tuning_profile: str = "default",
+    db_parameter_overrides: dict = None,
+    db_monitoring: dict = None,
 ):
-    """Create RDS Aurora PostgreSQL cluster with pgvector"""
+    """
+    Create RDS Aurora PostgreSQL cluster with pgvector
+    
+    Returns:
+        Tuple of (cluster, credentials secret, RDS Proxy or None,
+        read-only endpoint or None when the cluster has no readers)
+    """
+    
+    proxy_settings = {**DEFAULT_DB_PROXY, **(db_proxy or {})}
+    monitoring_settings = {**DEFAULT_DB_MONITORING, **(db_monitoring or {})}
+    reader_settings = {**DEFAULT_DB_READERS, **(db_readers or {})}
+    reader_settings["autoscaling"] = {
+        **DEFAULT_DB_READERS["autoscaling"],
+        **((db_readers or {}).get("autoscaling") or {}),
+    }
+    
+    if db_capacity_mode not in ("provisioned", "serverless"):
+        raise ValueError(f"db_capacity_mode must be 'provisioned' or 'serverless', got '{db_capacity_mode}'")
+    
+    # Serverless v2 scales each instance between the ACU bounds instead of a fixed class
+    serverless = db_capacity_mode == "serverless"
+    serverless_settings = {**DEFAULT_DB_SERVERLESS, **(db_serverless or {})}
+    if serverless_settings["min_capacity"] > serverless_settings["max_capacity"]:
+        raise ValueError(
+            f"db_serverless min_capacity ({serverless_settings['min_capacity']}) "
+            f"exceeds max_capacity ({serverless_settings['max_capacity']})"
+        )
+    writer_instance_class = "db.serverless" if serverless else "db.t4g.medium"
+    
+    if db_tuning_profile not in DB_TUNING_PROFILES:
+        raise ValueError(
+            f"Unknown db_tuning_profile '{db_tuning_profile}', expected one of {sorted(DB_TUNING_PROFILES)}"
+        )
+    cluster_parameters = {
+        **DB_TUNING_PROFILES[db_tuning_profile]["cluster"],
+        **((db_parameter_overrides or {}).get("cluster") or {}),
+    }
+    instance_parameters = {
+        **DB_TUNING_PROFILES[db_tuning_profile]["instance"],
+        **((db_parameter_overrides or {}).get("instance") or {}),
+    }
+    reader_instance_class = "db.serverless" if serverless else reader_settings["instance_class"]
+    
+    if monitoring_settings["slow_query_metric"] and "log_min_duration_statement" not in cluster_parameters:
+        pulumi.log.warn(
+            f"db_monitoring.slow_query_metric is on but db_tuning_profile '{db_tuning_profile}' doesn't set "
+            "log_min_duration_statement, so SlowQueryCount stays 0; use a pgvector profile or override it"
+        )
     
     # Create security group for RDS
     rds_sg = aws.ec2.SecurityGroup(
@@ -52,12 +205,39 @@ def create_rds(
         family="aurora-postgresql15",  # Match engine version family
         description="Parameter group for Learning Center database",
         # pgvector will be enabled via SQL after cluster creation
+        parameters=[
+            aws.rds.ClusterParameterGroupParameterArgs(
+                name=name,
+                value=str(value),
+                apply_method="pending-reboot" if name in STATIC_DB_PARAMETERS else "immediate",
+            )
+            for name, value in sorted(cluster_parameters.items())
+        ],
         tags={
             "Name": f"{project_name}-db-cluster-params",
             "Environment": environment,
         },
     )
     
+    # Instance-level parameters (memory settings sized for the instance class)
+    db_instance_parameter_group = aws.rds.ParameterGroup(
+        f"{project_name}-db-instance-params",
+        family="aurora-postgresql15",
+        description="Instance parameter group for Learning Center database",
+        parameters=[
+            aws.rds.ParameterGroupParameterArgs(
+                name=name,
+                value=str(value),
+                apply_method="pending-reboot" if name in STATIC_DB_PARAMETERS else "immediate",
+            )
+            for name, value in sorted(instance_parameters.items())
+        ],
+        tags={
+            "Name": f"{project_name}-db-instance-params",
+            "Environment": environment,
+        },
+    )
+    
     # Create Secrets Manager secret for database credentials
     db_secret = aws.secretsmanager.Secret(
         f"{project_name}-db-credentials",
@@ -94,6 +274,10 @@ def create_rds(
         preferred_backup_window="03:00-04:00",
         preferred_maintenance_window="mon:04:00-mon:05:00",
         enabled_cloudwatch_logs_exports=["postgresql"],
+        serverlessv2_scaling_configuration=aws.rds.ClusterServerlessv2ScalingConfigurationArgs(
+            min_capacity=serverless_settings["min_capacity"],
+            max_capacity=serverless_settings["max_capacity"],
+        ) if serverless else None,
         skip_final_snapshot=True,
         deletion_protection=False,  # Set to True for production
         tags={
@@ -102,21 +286,78 @@ def create_rds(
         },
     )
     
+    # Performance Insights and Enhanced Monitoring apply to every instance
+    instance_monitoring = _instance_monitoring_args(project_name, environment, monitoring_settings)
+    
+    # RDS only creates the postgresql export's log group once an instance first logs, so the slow-query
+    # filter would race it on a fresh stack. Own the group instead; instances wait for it so RDS never
+    # creates it first
+    db_log_group = None
+    if monitoring_settings["slow_query_metric"]:
+        db_log_group = aws.cloudwatch.LogGroup(
+            f"{project_name}-db-postgresql-logs",
+            name=rds_cluster.cluster_identifier.apply(
+                lambda cluster_id: f"/aws/rds/cluster/{cluster_id}/postgresql"
+            ),
+            retention_in_days=monitoring_settings["log_retention_days"],
+            tags={
+                "Name": f"{project_name}-db-postgresql-logs",
+                "Environment": environment,
+            },
+        )
+    
     # Create RDS instance
     rds_instance = aws.rds.ClusterInstance(
         f"{project_name}-db-instance",
         identifier=f"{project_name}-db-instance-1",
         cluster_identifier=rds_cluster.id,
-        instance_class="db.t4g.medium",
+        instance_class=writer_instance_class,
+        db_parameter_group_name=db_instance_parameter_group.name,
         engine=rds_cluster.engine,
         engine_version=rds_cluster.engine_version,
         publicly_accessible=False,
+        promotion_tier=0,
+        **instance_monitoring,
         tags={
             "Name": f"{project_name}-db-instance",
             "Environment": environment,
         },
+        opts=pulumi.ResourceOptions(depends_on=[db_log_group] if db_log_group else None),
     )
     
+    # Reader instances serve the cluster reader endpoint (dashboards, pgvector similarity search)
+    reader_instances = []
+    for i in range(reader_settings["count"]):
+        tiers = reader_settings["promotion_tiers"]
+        reader_instances.append(aws.rds.ClusterInstance(
+            f"{project_name}-db-reader-{i+1}",
+            identifier=f"{project_name}-db-reader-{i+1}",
+            cluster_identifier=rds_cluster.id,
+            instance_class=reader_instance_class,
+            db_parameter_group_name=db_instance_parameter_group.name,
+            engine=rds_cluster.engine,
+            engine_version=rds_cluster.engine_version,
+            publicly_accessible=False,
+            promotion_tier=tiers[i] if i < len(tiers) else 1,
+            **instance_monitoring,
+            tags={
+                "Name": f"{project_name}-db-reader-{i+1}",
+                "Environment": environment,
+            },
+            opts=pulumi.ResourceOptions(depends_on=[rds_instance]),
+        ))
+    
+    if reader_settings["autoscaling"]["enabled"]:
+        _create_reader_autoscaling(
+            project_name=project_name,
+            environment=environment,
+            settings=reader_settings["autoscaling"],
+            rds_cluster=rds_cluster,
+            opts=pulumi.ResourceOptions(depends_on=[rds_instance, *reader_instances]),
+        )
+    
+    has_readers = reader_settings["count"] > 0 or reader_settings["autoscaling"]["enabled"]
+    
     # Store database credentials in Secrets Manager
     db_secret_version = aws.secretsmanager.SecretVersion(
         f"{project_name}-db-secret-version",
@@ -133,4 +374,269 @@ def create_rds(
     # Note: pgvector extension must be enabled after cluster creation
     # Run via RDS Data API or psql connection (see setup-database.sh)
     
-    return rds_cluster, db_secret
+    if db_log_group:
+        _create_slow_query_metric(
+            project_name=project_name,
+            settings=monitoring_settings,
+            log_group=db_log_group,
+        )
+    
+    db_proxy_resource = None
+    if proxy_settings["enabled"]:
+        db_proxy_resource = _create_db_proxy(
+            project_name=project_name,
+            environment=environment,
+            settings=proxy_settings,
+            subnets=subnets,
+            rds_sg=rds_sg,
+            rds_cluster=rds_cluster,
+            db_secret=db_secret,
+            opts=pulumi.ResourceOptions(depends_on=[db_secret_version, rds_instance]),
+        )
+    
+    read_endpoint = None
+    if has_readers and db_proxy_resource:
+        # Read-only proxy endpoint pools reader connections the same way
+        read_only_proxy_endpoint = aws.rds.ProxyEndpoint(
+            f"{project_name}-db-proxy-read-only",
+            db_proxy_name=db_proxy_resource.name,
+            db_proxy_endpoint_name=f"{project_name}-db-proxy-read-only",
+            target_role="READ_ONLY",
+            vpc_subnet_ids=[s.id for s in subnets],
+            vpc_security_group_ids=[rds_sg.id],
+            tags={
+                "Name": f"{project_name}-db-proxy-read-only",
+                "Environment": environment,
+            },
+        )
+        read_endpoint = read_only_proxy_endpoint.endpoint
+    elif has_readers:
+        read_endpoint = rds_cluster.reader_endpoint
+    
+    return rds_cluster, db_secret, db_proxy_resource, read_endpoint
+
+
+def _instance_monitoring_args(project_name: str, environment: str, settings: dict) -> dict:
+    """ClusterInstance arguments enabling Performance Insights and Enhanced Monitoring"""
+    
+    args = {}
+    
+    if settings["performance_insights"]:
+        args["performance_insights_enabled"] = True
+        args["performance_insights_retention_period"] = settings["performance_insights_retention"]
+        if settings["performance_insights_kms_key_id"]:
+            args["performance_insights_kms_key_id"] = settings["performance_insights_kms_key_id"]
+    
+    if settings["monitoring_interval"]:
+        # Role RDS uses to ship OS metrics to CloudWatch Logs
+        monitoring_role = aws.iam.Role(
+            f"{project_name}-rds-monitoring-role",
+            assume_role_policy=json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    "Action": "sts:AssumeRole",
+                    "Effect": "Allow",
+                    "Principal": {
+                        "Service": "monitoring.rds.amazonaws.com",
+                    },
+                }],
+            }),
+            tags={
+                "Name": f"{project_name}-rds-monitoring-role",
+                "Environment": environment,
+            },
+        )
+        
+        monitoring_policy = aws.iam.RolePolicyAttachment(
+            f"{project_name}-rds-monitoring-policy",
+            role=monitoring_role.name,
+            policy_arn="arn:aws:iam::aws:policy/service-role/AmazonRDSEnhancedMonitoringRole",
+        )
+        
+        args["monitoring_interval"] = settings["monitoring_interval"]
+        # Wait for the policy attachment so RDS can assume a working role
+        args["monitoring_role_arn"] = pulumi.Output.all(monitoring_role.arn, monitoring_policy.id).apply(
+            lambda args: args[0]
+        )
+    
+    return args
+
+
+def _create_slow_query_metric(
+    project_name: str,
+    settings: dict,
+    log_group: aws.cloudwatch.LogGroup,
+):
+    """Count `duration:` lines (log_min_duration_statement) in the exported postgresql log"""
+    
+    return aws.cloudwatch.LogMetricFilter(
+        f"{project_name}-db-slow-queries",
+        name=f"{project_name}-db-slow-queries",
+        log_group_name=log_group.name,
+        pattern='"duration:"',
+        metric_transformation=aws.cloudwatch.LogMetricFilterMetricTransformationArgs(
+            name="SlowQueryCount",
+            namespace=settings["slow_query_namespace"],
+            value="1",
+            default_value="0",
+        ),
+    )
+
+
+def _create_reader_autoscaling(
+    project_name: str,
+    environment: str,
+    settings: dict,
+    rds_cluster: aws.rds.Cluster,
+    opts: pulumi.ResourceOptions = None,
+):
+    """Scale the number of Aurora replicas on reader CPU and/or connections"""
+    
+    target = aws.appautoscaling.Target(
+        f"{project_name}-db-reader-scaling-target",
+        service_namespace="rds",
+        scalable_dimension="rds:cluster:ReadReplicaCount",
+        resource_id=rds_cluster.cluster_identifier.apply(lambda cluster_id: f"cluster:{cluster_id}"),
+        min_capacity=settings["min_capacity"],
+        max_capacity=settings["max_capacity"],
+        tags={
+            "Name": f"{project_name}-db-reader-scaling-target",
+            "Environment": environment,
+        },
+        opts=opts,
+    )
+    
+    metrics = {
+        "cpu": ("RDSReaderAverageCPUUtilization", settings.get("cpu_target")),
+        "connections": ("RDSReaderAverageDatabaseConnections", settings.get("connections_target")),
+    }
+    
+    for policy_name, (metric_type, target_value) in metrics.items():
+        if not target_value:
+            continue
+        aws.appautoscaling.Policy(
+            f"{project_name}-db-reader-{policy_name}-scaling",
+            name=f"{project_name}-db-reader-{policy_name}-scaling",
+            policy_type="TargetTrackingScaling",
+            resource_id=target.resource_id,
+            scalable_dimension=target.scalable_dimension,
+            service_namespace=target.service_namespace,
+            target_tracking_scaling_policy_configuration=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationArgs(
+                target_value=target_value,
+                scale_in_cooldown=settings["scale_in_cooldown"],
+                scale_out_cooldown=settings["scale_out_cooldown"],
+                predefined_metric_specification=aws.appautoscaling.PolicyTargetTrackingScalingPolicyConfigurationPredefinedMetricSpecificationArgs(
+                    predefined_metric_type=metric_type,
+                ),
+            ),
+        )
+    
+    return target
+
+
+def _create_db_proxy(
+    project_name: str,
+    environment: str,
+    settings: dict,
+    subnets: list,
+    rds_sg: aws.ec2.SecurityGroup,
+    rds_cluster: aws.rds.Cluster,
+    db_secret: aws.secretsmanager.Secret,
+    opts: pulumi.ResourceOptions = None,
+):
+    """Create an RDS Proxy that pools php-fpm connections in front of the cluster"""
+    
+    # IAM role the proxy uses to read the database credentials secret
+    proxy_role = aws.iam.Role(
+        f"{project_name}-db-proxy-role",
+        assume_role_policy=json.dumps({
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Action": "sts:AssumeRole",
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "rds.amazonaws.com",
+                },
+            }],
+        }),
+        tags={
+            "Name": f"{project_name}-db-proxy-role",
+            "Environment": environment,
+        },
+    )
+    
+    aws.iam.RolePolicy(
+        f"{project_name}-db-proxy-policy",
+        role=proxy_role.id,
+        policy=db_secret.arn.apply(
+            lambda arn: json.dumps({
+                "Version": "2012-10-17",
+                "Statement": [
+                    {
+                        "Effect": "Allow",
+                        "Action": [
+                            "secretsmanager:GetSecretValue",
+                            "secretsmanager:DescribeSecret",
+                        ],
+                        "Resource": arn,
+                    },
+                ],
+            })
+        ),
+    )
+    
+    # The proxy shares the RDS security group and must reach the cluster through it
+    aws.ec2.SecurityGroupRule(
+        f"{project_name}-db-proxy-to-cluster",
+        type="ingress",
+        from_port=5432,
+        to_port=5432,
+        protocol="tcp",
+        self=True,
+        security_group_id=rds_sg.id,
+        description="Allow RDS Proxy to reach the Aurora cluster",
+    )
+    
+    db_proxy = aws.rds.Proxy(
+        f"{project_name}-db-proxy",
+        name=f"{project_name}-db-proxy",
+        engine_family="POSTGRESQL",
+        role_arn=proxy_role.arn,
+        vpc_subnet_ids=[s.id for s in subnets],
+        vpc_security_group_ids=[rds_sg.id],
+        require_tls=settings["require_tls"],
+        idle_client_timeout=settings["idle_client_timeout"],
+        auths=[
+            aws.rds.ProxyAuthArgs(
+                auth_scheme="SECRETS",
+                iam_auth="DISABLED",
+                secret_arn=db_secret.arn,
+                description="Learning Center database credentials",
+            ),
+        ],
+        tags={
+            "Name": f"{project_name}-db-proxy",
+            "Environment": environment,
+        },
+        opts=opts,
+    )
+    
+    aws.rds.ProxyDefaultTargetGroup(
+        f"{project_name}-db-proxy-target-group",
+        db_proxy_name=db_proxy.name,
+        connection_pool_config=aws.rds.ProxyDefaultTargetGroupConnectionPoolConfigArgs(
+            max_connections_percent=settings["max_connections_percent"],
+            max_idle_connections_percent=settings["max_idle_connections_percent"],
+            connection_borrow_timeout=settings["connection_borrow_timeout"],
+            session_pinning_filters=settings["session_pinning_filters"],
+        ),
+    )
+    
+    aws.rds.ProxyTarget(
+        f"{project_name}-db-proxy-target",
+        db_proxy_name=db_proxy.name,
+        target_group_name="default",
+        db_cluster_identifier=rds_cluster.cluster_identifier,
+    )
+    
+    return db_proxy
@@ -1,20 +1,116 @@
 """
 ElastiCache Redis Cluster
-Creates Redis cluster for caching and queues
+Creates Redis replication groups for cache, queues and sessions
 """
 
 import pulumi
 import pulumi_aws as aws
 
 
+REDIS_MODES = ("single", "replicated", "cluster")
+REDIS_WORKLOADS = ("cache", "queue", "session")
+
+# Workloads whose replication group may run cluster mode. Laravel's queue Lua scripts touch
+# several un-hash-tagged keys (CROSSSLOT) and Horizon has no cluster client, so the queue
+# group (and the shared group, which serves queues) always stays single or replicated
+CLUSTER_MODE_WORKLOADS = ("cache", "session")
+
+# Replication group layout; override per stack with the `redis` config object
+#   single:     one node, no failover (dev)
+#   replicated: primary + `replicas` read replicas with Multi-AZ automatic failover
+#   cluster:    cluster mode enabled, `num_node_groups` shards of 1 + `replicas_per_node_group` nodes
+DEFAULT_REDIS = {
+    "mode": "single",
+    "node_type": "cache.t4g.micro",
+    "maxmemory_policy": "allkeys-lru",
+    "replicas": 1,
+    "num_node_groups": 2,
+    "replicas_per_node_group": 1,
+}
+
+# Per-workload groups, enabled by a `workloads` map in the `redis` config object.
+# Queued jobs and sessions must never be evicted, so only the cache group runs LRU.
+DEFAULT_REDIS_WORKLOADS = {
+    "cache": {"node_type": "cache.t4g.small", "maxmemory_policy": "allkeys-lru"},
+    "queue": {"node_type": "cache.t4g.micro", "maxmemory_policy": "noeviction"},
+    "session": {"node_type": "cache.t4g.micro", "maxmemory_policy": "noeviction"},
+}
+
+
+def redis_endpoint(redis_cluster: aws.elasticache.ReplicationGroup, mode: str) -> pulumi.Output:
+    """Endpoint clients should connect to for the given mode"""
+    if mode == "cluster":
+        return redis_cluster.configuration_endpoint_address
+    return redis_cluster.primary_endpoint_address
+
+
+def redis_workload_settings(settings: dict = None) -> dict:
+    """
+    Resolve the replication groups to create from the `redis` config object
+
+    Returns:
+        Dict of group key to merged settings: {"shared": ...} by default, or one
+        entry per workload in REDIS_WORKLOADS when `workloads` is set
+    """
+    settings = dict(settings or {})
+    workloads = settings.pop("workloads", None) or {}
+    
+    unknown = set(workloads) - set(REDIS_WORKLOADS)
+    if unknown:
+        raise ValueError(f"unknown redis workloads {sorted(unknown)}, expected {REDIS_WORKLOADS}")
+    
+    if not workloads:
+        groups = {"shared": {**DEFAULT_REDIS, **settings}}
+    else:
+        groups = {
+            workload: {
+                **DEFAULT_REDIS,
+                **DEFAULT_REDIS_WORKLOADS[workload],
+                **settings,
+                **(workloads.get(workload) or {}),
+            }
+            for workload in REDIS_WORKLOADS
+        }
+    
+    for group, group_settings in groups.items():
+        mode = group_settings["mode"]
+        if mode not in REDIS_MODES:
+            raise ValueError(f"redis mode must be one of {REDIS_MODES}, got '{mode}'")
+        if mode == "cluster" and group not in CLUSTER_MODE_WORKLOADS:
+            serves = "queues and Horizon" if group == "queue" else "queues and Horizon as well as cache and sessions"
+            raise ValueError(
+                f"redis group '{group}' serves {serves} and can't use cluster mode; "
+                f"use 'replicated', or set `workloads` and enable cluster mode for {' / '.join(CLUSTER_MODE_WORKLOADS)} only"
+            )
+        if mode == "replicated" and group_settings["replicas"] < 1:
+            raise ValueError("redis mode 'replicated' needs at least one replica")
+    
+    return groups
+
+
+def redis_workload_modes(settings: dict = None) -> dict:
+    """Mode of the replication group serving each workload in REDIS_WORKLOADS"""
+    groups = redis_workload_settings(settings)
+    return {workload: groups.get(workload, groups.get("shared"))["mode"] for workload in REDIS_WORKLOADS}
+
+
 def create_redis(
     project_name: str,
     environment: str,
     vpc_id: pulumi.Input[str],
     subnets: list,
     security_group_tags: dict,
-):
-    """Create ElastiCache Redis cluster"""
+    settings: dict = None,
+) -> dict:
+    """
+    Create ElastiCache Redis replication groups
+
+    Returns:
+        Dict of workload ("cache", "queue", "session") to replication group; all three
+        share one group unless `workloads` is set in settings
+    """
+    
+    groups = redis_workload_settings(settings)
     
     # Create security group for Redis
     redis_sg = aws.ec2.SecurityGroup(
@@ -51,47 +147,97 @@ def create_redis(
         },
     )
     
+    if "shared" in groups:
+        redis_cluster = _create_replication_group(
+            project_name, environment, f"{project_name}-redis", f"{project_name}-{environment}-redis",
+            groups["shared"], redis_subnet_group, redis_sg,
+        )
+        return {workload: redis_cluster for workload in REDIS_WORKLOADS}
+    
+    return {
+        workload: _create_replication_group(
+            project_name, environment, f"{project_name}-redis-{workload}",
+            f"{project_name}-{environment}-redis-{workload}",
+            groups[workload], redis_subnet_group, redis_sg,
+        )
+        for workload in REDIS_WORKLOADS
+    }
+
+
+def _create_replication_group(
+    project_name: str,
+    environment: str,
+    resource_name: str,
+    replication_group_id: str,
+    redis_settings: dict,
+    redis_subnet_group: aws.elasticache.SubnetGroup,
+    redis_sg: aws.ec2.SecurityGroup,
+) -> aws.elasticache.ReplicationGroup:
+    """Create one replication group with its own parameter group"""
+    mode = redis_settings["mode"]
+    
     # Create Redis parameter group
+    # cluster-enabled can't change on an attached group, so cluster mode gets its own
+    redis_parameters = [
+        aws.elasticache.ParameterGroupParameterArgs(
+            name="maxmemory-policy",
+            value=redis_settings["maxmemory_policy"],
+        ),
+    ]
+    if mode == "cluster":
+        redis_parameters.append(aws.elasticache.ParameterGroupParameterArgs(
+            name="cluster-enabled",
+            value="yes",
+        ))
+    
+    parameter_group_name = f"{resource_name}-cluster-params" if mode == "cluster" else f"{resource_name}-params"
     redis_parameter_group = aws.elasticache.ParameterGroup(
-        f"{project_name}-redis-params",
+        parameter_group_name,
         family="redis7",
         description="Parameter group for Redis",
-        parameters=[
-            aws.elasticache.ParameterGroupParameterArgs(
-                name="maxmemory-policy",
-                value="allkeys-lru",
-            ),
-        ],
+        parameters=redis_parameters,
         tags={
-            "Name": f"{project_name}-redis-params",
+            "Name": parameter_group_name,
             "Environment": environment,
         },
     )
     
+    # Node layout and failover for the selected mode
+    if mode == "cluster":
+        topology = {
+            "num_node_groups": redis_settings["num_node_groups"],
+            "replicas_per_node_group": redis_settings["replicas_per_node_group"],
+            "automatic_failover_enabled": True,
+            "multi_az_enabled": redis_settings["replicas_per_node_group"] > 0,
+        }
+    elif mode == "replicated":
+        topology = {
+            "num_cache_clusters": 1 + redis_settings["replicas"],
+            "automatic_failover_enabled": True,
+            "multi_az_enabled": True,
+        }
+    else:
+        topology = {
+            "num_cache_clusters": 1,
+            "automatic_failover_enabled": False,
+        }
+    
     # Create ElastiCache Redis cluster
     # Use unique name to avoid conflicts with existing resources
-    redis_id = f"{project_name}-{environment}-redis"
-    
-    # Check if Redis already exists and import it, otherwise create new
-    redis_cluster = aws.elasticache.ReplicationGroup(
-        f"{project_name}-redis",
-        replication_group_id=redis_id,
+    return aws.elasticache.ReplicationGroup(
+        resource_name,
+        replication_group_id=replication_group_id,
         description=f"Redis cluster for {project_name}",
-        node_type="cache.t4g.micro",
+        node_type=redis_settings["node_type"],
         port=6379,
         parameter_group_name=redis_parameter_group.name,
-        num_cache_clusters=1,  # Use 1 for dev, 2+ for production
         subnet_group_name=redis_subnet_group.name,
         security_group_ids=[redis_sg.id],
         at_rest_encryption_enabled=True,
         transit_encryption_enabled=False,  # Enable for production
-        automatic_failover_enabled=False,  # Enable for production with 2+ nodes
+        **topology,
         tags={
-            "Name": f"{project_name}-redis",
+            "Name": resource_name,
             "Environment": environment,
         },
     )
-    
-    # For single node, use primary_endpoint_address; for cluster mode, use configuration_endpoint_address
-    # Since we're using num_cache_clusters=1, we'll use primary_endpoint_address
-    return redis_cluster
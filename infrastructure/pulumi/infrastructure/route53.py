@@ -181,6 +181,44 @@ def create_alb_alias_record(
     return record
 
 
+def validate_acm_certificate(
+    zone_id: pulumi.Input[str],
+    certificate: aws.acm.Certificate,
+    domain_count: int = 1,
+    project_name: str = "learning-center",
+) -> aws.acm.CertificateValidation:
+    """
+    Create DNS validation records for an ACM certificate and wait for it to be issued
+    
+    Args:
+        zone_id: Route53 hosted zone ID that serves the certificate's domains
+        certificate: Certificate from create_acm_certificate (same region as the default provider)
+        domain_count: Number of names on the certificate (primary domain + SANs)
+        project_name: Project name for resource names
+    
+    Returns:
+        CertificateValidation; use its certificate_arn so listeners wait for issuance
+    """
+    records = []
+    for i in range(domain_count):
+        option = certificate.domain_validation_options[i]
+        records.append(aws.route53.Record(
+            f"{project_name}-cert-validation-{i}",
+            zone_id=zone_id,
+            name=option.resource_record_name,
+            type=option.resource_record_type,
+            records=[option.resource_record_value],
+            ttl=60,
+            allow_overwrite=True,
+        ))
+    
+    return aws.acm.CertificateValidation(
+        f"{project_name}-cert-validation",
+        certificate_arn=certificate.arn,
+        validation_record_fqdns=[record.fqdn for record in records],
+    )
+
+
 def create_certificate_validation_record(
     zone_id: pulumi.Input[str],
     certificate_validation: aws.acm.CertificateValidation,
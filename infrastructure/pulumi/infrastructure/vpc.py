@@ -6,8 +6,10 @@ Creates VPC, subnets, internet gateway, NAT gateway, and security groups
 import pulumi
 import pulumi_aws as aws
 
+from infrastructure.endpoints import create_vpc_endpoints
 
-def create_vpc(project_name: str, environment: str):
+
+def create_vpc(project_name: str, environment: str, endpoints: dict = None):
     """Create VPC with public, private, and database subnets"""
     
     # Get availability zones
@@ -174,4 +176,14 @@ def create_vpc(project_name: str, environment: str):
             route_table_id=private_rts[rt_index].id,
         )
     
+    # Keep ECR pulls, secret lookups, log shipping and S3 traffic off the NAT gateways
+    create_vpc_endpoints(
+        project_name=project_name,
+        environment=environment,
+        vpc=vpc,
+        subnet_ids=[s.id for s in private_subnets],
+        route_table_ids=[rt.id for rt in private_rts],
+        settings=endpoints,
+    )
+    
     return vpc, public_subnets, private_subnets, database_subnets, db_subnet_group
@@ -1,21 +1,201 @@
 """
 Use Existing VPC Infrastructure
-Uses an existing VPC and creates subnets or uses existing subnets
+Uses an existing VPC, sorting its subnets into public, private and database tiers
+by route table, tags and availability zone
 """
 
 import pulumi
 import pulumi_aws as aws
 
+from infrastructure.endpoints import create_vpc_endpoints, existing_endpoint_services, vpc_endpoint_settings
+
+
+SUBNET_TIERS = ("public", "private", "database")
+
+# Tag keys checked (in order) for an explicit tier; create_vpc tags its subnets with Type
+TIER_TAG_KEYS = ("Tier", "Type")
+
+# Defaults; override per stack with the `existing_vpc_subnets` config object
+#   az_count:                  AZs every tier spans; all tiers use the same AZs so ECS, Redis and Aurora stay AZ-local
+#   public/private/database:   optional subnet id lists that pin a tier instead of discovering it
+DEFAULT_EXISTING_VPC_SUBNETS = {
+    "az_count": 2,
+    "public": None,
+    "private": None,
+    "database": None,
+}
+
+# A tier with no subnets of its own borrows from the next tier in its list
+TIER_FALLBACKS = {
+    "public": [],
+    "private": ["public"],
+    "database": ["private", "public"],
+}
+
+
+def _route_tier(routes: list) -> str:
+    """Tier implied by a route table's default route"""
+    for route in routes:
+        if route.cidr_block != "0.0.0.0/0":
+            continue
+        if (route.gateway_id or "").startswith("igw-"):
+            return "public"
+        if route.nat_gateway_id or route.transit_gateway_id or route.network_interface_id or route.instance_id:
+            return "private"
+    return "database"
+
+
+def classify_subnets(subnets: list, route_tables: list) -> dict:
+    """
+    Sort subnets into tiers
+
+    A Tier/Type tag wins; otherwise the subnet's route table decides (default route to an
+    internet gateway = public, to a NAT/transit gateway = private, none = database).
+    Subnets without an explicit association follow the VPC's main route table.
+
+    Args:
+        subnets: get_subnet results
+        route_tables: get_route_table results for the VPC
+
+    Returns:
+        Dict of subnet id to (tier, source)
+    """
+    main_tier = "database"
+    subnet_tiers = {}
+    for route_table in route_tables:
+        tier = _route_tier(route_table.routes)
+        for association in route_table.associations:
+            if association.main:
+                main_tier = tier
+            elif association.subnet_id:
+                subnet_tiers[association.subnet_id] = tier
+
+    classified = {}
+    for subnet in subnets:
+        tags = subnet.tags or {}
+        tag_tier = next((tags[key].lower() for key in TIER_TAG_KEYS if tags.get(key, "").lower() in SUBNET_TIERS), None)
+        if tag_tier:
+            classified[subnet.id] = (tag_tier, "tag")
+        elif subnet.id in subnet_tiers:
+            classified[subnet.id] = (subnet_tiers[subnet.id], "route-table")
+        else:
+            classified[subnet.id] = (main_tier, "main-route-table")
+    return classified
+
+
+def tier_route_table_ids(subnet_ids: list, route_tables: list) -> list:
+    """Route tables the given subnets use: their explicit association, else the VPC's main route table"""
+    main_route_table = None
+    subnet_route_tables = {}
+    for route_table in route_tables:
+        for association in route_table.associations:
+            if association.main:
+                main_route_table = route_table.route_table_id
+            elif association.subnet_id:
+                subnet_route_tables[association.subnet_id] = route_table.route_table_id
+    return sorted({subnet_route_tables.get(subnet_id, main_route_table) for subnet_id in subnet_ids} - {None})
+
+
+def select_tier_subnets(subnets: list, classified: dict, settings: dict) -> dict:
+    """
+    Pick one subnet per AZ for every tier, using the same AZs across tiers
+
+    Args:
+        subnets: get_subnet results
+        classified: classify_subnets result
+        settings: Merged `existing_vpc_subnets` settings
+
+    Returns:
+        Validation report: per-tier subnet_ids, availability_zones and source, plus warnings
+
+    Raises:
+        ValueError: If the tiers share fewer than az_count AZs
+    """
+    az_of = {subnet.id: subnet.availability_zone for subnet in subnets}
+    warnings = []
+
+    pools = {}
+    sources = {}
+    for tier in SUBNET_TIERS:
+        if settings.get(tier):
+            unknown = sorted(set(settings[tier]) - set(az_of))
+            if unknown:
+                raise ValueError(f"existing_vpc_subnets.{tier} lists subnets outside the VPC: {', '.join(unknown)}")
+            pools[tier] = sorted(settings[tier])
+            sources[tier] = ["config"]
+            continue
+
+        pools[tier] = sorted(subnet_id for subnet_id, (subnet_tier, _) in classified.items() if subnet_tier == tier)
+        sources[tier] = sorted({classified[subnet_id][1] for subnet_id in pools[tier]})
+        for fallback in TIER_FALLBACKS[tier]:
+            if pools[tier]:
+                break
+            if pools[fallback]:
+                pools[tier] = pools[fallback]
+                sources[tier] = [f"fallback:{fallback}"]
+                warnings.append(f"No {tier} subnets found; using {fallback} subnets for the {tier} tier")
+
+    if sources["private"] == ["fallback:public"]:
+        warnings.append(
+            "ECS tasks run without public IPs in public subnets; they reach AWS APIs through the VPC "
+            "endpoints but have no other outbound internet access"
+        )
+
+    tier_azs = {tier: {az_of[subnet_id] for subnet_id in pools[tier]} for tier in SUBNET_TIERS}
+    shared_azs = sorted(set.intersection(*tier_azs.values()))
+    az_count = settings["az_count"]
+    if len(shared_azs) < az_count:
+        spread = "; ".join(f"{tier}: {', '.join(sorted(tier_azs[tier])) or 'none'}" for tier in SUBNET_TIERS)
+        raise ValueError(
+            f"Existing VPC tiers share {len(shared_azs)} AZ(s), need {az_count} ({spread}). "
+            "Tag subnets with Tier=public|private|database or pin them with existing_vpc_subnets"
+        )
+
+    report = {}
+    used = set()
+    for tier in SUBNET_TIERS:
+        picked = []
+        for az in shared_azs[:az_count]:
+            candidates = [subnet_id for subnet_id in pools[tier] if az_of[subnet_id] == az]
+            # Prefer a subnet no other tier took, but share one rather than leave the AZ
+            picked.append(next((subnet_id for subnet_id in candidates if subnet_id not in used), candidates[0]))
+        used.update(picked)
+        report[tier] = {
+            "subnet_ids": picked,
+            "availability_zones": shared_azs[:az_count],
+            "source": sources[tier],
+        }
+
+    skipped = sorted(set().union(*(tier_azs[tier] for tier in SUBNET_TIERS)) - set(shared_azs[:az_count]))
+    if skipped:
+        warnings.append(f"AZs not used by every tier, left out: {', '.join(skipped)}")
+
+    report["warnings"] = warnings
+    return report
+
+
+def use_existing_vpc(project_name: str, environment: str, vpc_id: str, endpoints: dict = None, subnets: dict = None):
+    """
+    Use existing VPC and sort its subnets into tiers
+
+    Args:
+        project_name: Project name for resource names
+        environment: Environment name
+        vpc_id: Existing VPC ID
+        endpoints: `vpc_endpoints` config overrides
+        subnets: `existing_vpc_subnets` config overrides
+
+    Returns:
+        Tuple of (vpc, public_subnets, private_subnets, database_subnets, db_subnet_group, subnet_report)
+    """
+    subnet_settings = {**DEFAULT_EXISTING_VPC_SUBNETS, **(subnets or {})}
 
-def use_existing_vpc(project_name: str, environment: str, vpc_id: str):
-    """Use existing VPC and get/create subnets"""
-    
     # Get existing VPC
     vpc = aws.ec2.Vpc.get(
         f"{project_name}-vpc",
         vpc_id,
     )
-    
+
     # Get existing subnets in the VPC
     existing_subnets_data = aws.ec2.get_subnets(
         filters=[
@@ -25,24 +205,34 @@ def use_existing_vpc(project_name: str, environment: str, vpc_id: str):
             ),
         ],
     )
-    
-    # Use existing subnets (default VPC has 6 subnets)
-    # Use first 2 as public, next 2 as private, last 2 as database
+    existing_subnets = [aws.ec2.get_subnet(id=subnet_id) for subnet_id in existing_subnets_data.ids]
+
+    route_tables = aws.ec2.get_route_tables(vpc_id=vpc_id)
+    route_table_details = [aws.ec2.get_route_table(route_table_id=rt_id) for rt_id in route_tables.ids]
+
+    subnet_report = select_tier_subnets(
+        existing_subnets,
+        classify_subnets(existing_subnets, route_table_details),
+        subnet_settings,
+    )
+    for warning in subnet_report["warnings"]:
+        pulumi.log.warn(f"use_existing_vpc: {warning}")
+
     public_subnets = [
-        aws.ec2.Subnet.get(f"{project_name}-public-subnet-{i+1}", existing_subnets_data.ids[i])
-        for i in range(min(2, len(existing_subnets_data.ids)))
+        aws.ec2.Subnet.get(f"{project_name}-public-subnet-{i+1}", subnet_id)
+        for i, subnet_id in enumerate(subnet_report["public"]["subnet_ids"])
     ]
-    
+
     private_subnets = [
-        aws.ec2.Subnet.get(f"{project_name}-private-subnet-{i+1}", existing_subnets_data.ids[i+2] if len(existing_subnets_data.ids) > i+2 else existing_subnets_data.ids[i])
-        for i in range(min(2, len(existing_subnets_data.ids)))
+        aws.ec2.Subnet.get(f"{project_name}-private-subnet-{i+1}", subnet_id)
+        for i, subnet_id in enumerate(subnet_report["private"]["subnet_ids"])
     ]
-    
+
     database_subnets = [
-        aws.ec2.Subnet.get(f"{project_name}-database-subnet-{i+1}", existing_subnets_data.ids[i+4] if len(existing_subnets_data.ids) > i+4 else existing_subnets_data.ids[i % len(existing_subnets_data.ids)])
-        for i in range(min(2, len(existing_subnets_data.ids)))
+        aws.ec2.Subnet.get(f"{project_name}-database-subnet-{i+1}", subnet_id)
+        for i, subnet_id in enumerate(subnet_report["database"]["subnet_ids"])
     ]
-    
+
     # Create database subnet group
     db_subnet_group = aws.rds.SubnetGroup(
         f"{project_name}-db-subnet-group",
@@ -52,5 +242,28 @@ def use_existing_vpc(project_name: str, environment: str, vpc_id: str):
             "Environment": environment,
         },
     )
-    
-    return vpc, public_subnets, private_subnets, database_subnets, db_subnet_group
+
+    # Keep ECR pulls, secret lookups, log shipping and S3 traffic off the NAT/internet path.
+    # Private tier is already one subnet per AZ. On a shared VPC the S3 gateway route only goes on
+    # the selected subnets' route tables, and services another stack already covers are left alone
+    endpoint_settings = vpc_endpoint_settings(endpoints)
+    skip_services = []
+    if endpoint_settings["skip_existing"]:
+        skip_services = existing_endpoint_services(project_name, vpc_id, endpoint_settings)
+        for service in skip_services:
+            pulumi.log.info(f"use_existing_vpc: {vpc_id} already has a {service} endpoint, not creating one")
+
+    create_vpc_endpoints(
+        project_name=project_name,
+        environment=environment,
+        vpc=vpc,
+        subnet_ids=subnet_report["private"]["subnet_ids"],
+        route_table_ids=tier_route_table_ids(
+            sorted({subnet_id for tier in SUBNET_TIERS for subnet_id in subnet_report[tier]["subnet_ids"]}),
+            route_table_details,
+        ),
+        settings=endpoints,
+        skip_services=skip_services,
+    )
+
+    return vpc, public_subnets, private_subnets, database_subnets, db_subnet_group, subnet_report
@@ -0,0 +1,99 @@
+#!/bin/bash
+# Compare requests/sec of two backend images under the web task's Fargate size
+#
+# Usage (from infrastructure/pulumi):
+#   ./scripts/benchmark-image.sh <baseline-image> <candidate-image>
+#
+# e.g. the image currently in ECR against a local build of this Dockerfile:
+#   docker pull "$ECR_URL:latest"
+#   docker build -f Dockerfile -t learning-center-backend:candidate ../..
+#   ./scripts/benchmark-image.sh "$ECR_URL:latest" learning-center-backend:candidate
+#
+# Both containers get the same CPU/memory limits and a database-free environment, so the
+# numbers reflect the PHP runtime (framework boot, routing, php-fpm) rather than Postgres.
+# The before/after table (image IDs, limits, req/s and latency) is also written as Markdown to
+# BENCH_RESULTS (default benchmark-results.md) for the change description.
+
+set -e
+
+BASELINE_IMAGE="$1"
+CANDIDATE_IMAGE="$2"
+BENCH_PATH="${BENCH_PATH:-/health}"
+BENCH_CPUS="${BENCH_CPUS:-0.5}"
+BENCH_MEMORY="${BENCH_MEMORY:-1g}"
+CONCURRENCY="${CONCURRENCY:-32}"
+DURATION="${DURATION:-30}"
+BENCH_RESULTS="${BENCH_RESULTS:-benchmark-results.md}"
+
+if [ -z "$BASELINE_IMAGE" ] || [ -z "$CANDIDATE_IMAGE" ]; then
+    echo "Usage: $0 <baseline-image> <candidate-image>"
+    exit 1
+fi
+
+cd "$(dirname "$0")/.."
+
+APP_KEY="base64:$(head -c 32 /dev/urandom | base64)"
+CONTAINERS=()
+cleanup() {
+    docker rm -f "${CONTAINERS[@]}" > /dev/null 2>&1 || true
+}
+trap cleanup EXIT
+
+start_container() {
+    local name="$1" image="$2" port="$3"
+    docker run -d --rm \
+        --name "$name" \
+        --cpus "$BENCH_CPUS" \
+        --memory "$BENCH_MEMORY" \
+        -p "127.0.0.1:$port:80" \
+        -e APP_ENV=production \
+        -e APP_DEBUG=false \
+        -e APP_KEY="$APP_KEY" \
+        -e APP_URL="http://localhost:$port" \
+        -e LOG_CHANNEL=stderr \
+        -e SESSION_DRIVER=array \
+        -e CACHE_STORE=array \
+        -e QUEUE_CONNECTION=sync \
+        "$image" > /dev/null
+    CONTAINERS+=("$name")
+
+    for _ in $(seq 1 60); do
+        if curl -fs "http://127.0.0.1:$port$BENCH_PATH" > /dev/null; then
+            return 0
+        fi
+        sleep 1
+    done
+    echo "❌ $image did not answer on $BENCH_PATH"
+    docker logs "$name" | tail -20
+    exit 1
+}
+
+echo "🐳 Starting containers ($BENCH_CPUS vCPU, $BENCH_MEMORY)..."
+start_container bench-baseline "$BASELINE_IMAGE" 8081
+start_container bench-candidate "$CANDIDATE_IMAGE" 8082
+
+echo "📈 $CONCURRENCY clients, ${DURATION}s per image (baseline: $BASELINE_IMAGE, candidate: $CANDIDATE_IMAGE)"
+TABLE=$(python3 scripts/loadtest.py \
+    "http://127.0.0.1:8081$BENCH_PATH" \
+    "http://127.0.0.1:8082$BENCH_PATH" \
+    --labels baseline candidate \
+    --concurrency "$CONCURRENCY" \
+    --duration "$DURATION" \
+    --markdown)
+
+image_id() {
+    docker image inspect --format '{{.Id}}' "$1" | cut -c1-19
+}
+
+cat > "$BENCH_RESULTS" <<RESULTS
+GET $BENCH_PATH, $BENCH_CPUS vCPU / $BENCH_MEMORY per container, $CONCURRENCY keep-alive clients, ${DURATION}s measured on $(uname -m)
+
+- baseline: \`$BASELINE_IMAGE\` ($(image_id "$BASELINE_IMAGE"))
+- candidate: \`$CANDIDATE_IMAGE\` ($(image_id "$CANDIDATE_IMAGE"))
+
+$TABLE
+RESULTS
+
+cat "$BENCH_RESULTS"
+echo ""
+echo "📝 Results written to $BENCH_RESULTS"
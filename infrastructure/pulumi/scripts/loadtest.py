@@ -0,0 +1,171 @@
+"""
+HTTP Load Generator
+Closed-loop keep-alive load against one or more URLs, reporting requests/sec and latency
+percentiles per URL, so two backend images can be compared side by side
+
+Usage:
+    python scripts/loadtest.py http://localhost:8081/health http://localhost:8082/health \\
+        --concurrency 32 --duration 30 [--labels baseline candidate] [--markdown]
+
+With several URLs, req/s of each is also reported relative to the first (the baseline).
+
+Standard library only. One Python process tops out at a few thousand requests/sec, well above
+what a single php-fpm task serves; run it on a different machine or cores than the target.
+"""
+
+import argparse
+import http.client
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, max(0, round(fraction * len(samples)) - 1))
+    return samples[index]
+
+
+def _worker(url, deadline: float, record_after: float, results: list, lock: threading.Lock):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    latencies, statuses, errors = [], {}, 0
+    connection = None
+    while time.perf_counter() < deadline:
+        if connection is None:
+            connection = connection_class(parts.netloc, timeout=30)
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Connection": "keep-alive"})
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = None
+            if started >= record_after:
+                errors += 1
+            continue
+        if started >= record_after:
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+        if response.will_close:
+            connection.close()
+            connection = None
+
+    if connection is not None:
+        connection.close()
+    with lock:
+        results.append((latencies, statuses, errors))
+
+
+def run_load(url: str, concurrency: int = 16, duration: float = 30, warmup: float = 5) -> dict:
+    """
+    Drive one URL with concurrency keep-alive clients
+
+    Args:
+        url: Target URL (GET)
+        concurrency: Parallel connections, each sending its next request as soon as the last returns
+        duration: Measured seconds
+        warmup: Seconds of load before measuring (fills OPcache, spawns workers, warms connections)
+
+    Returns:
+        Dict with requests, requests_per_second, non_2xx, errors and p50/p95/p99/max latency in ms
+    """
+    start = time.perf_counter()
+    record_after = start + warmup
+    deadline = record_after + duration
+    results, lock = [], threading.Lock()
+
+    threads = [
+        threading.Thread(target=_worker, args=(url, deadline, record_after, results, lock), daemon=True)
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = sorted(latency for worker_latencies, _, _ in results for latency in worker_latencies)
+    statuses = {}
+    for _, worker_statuses, _ in results:
+        for status, count in worker_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    return {
+        "url": url,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / duration,
+        "non_2xx": sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        "errors": sum(errors for _, _, errors in results),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def _relative_change(value: float, baseline: float) -> str:
+    if baseline <= 0:
+        return "n/a"
+    return f"{(value / baseline - 1) * 100:+.1f}%"
+
+
+def format_results(results: list, labels: list, markdown: bool = False) -> str:
+    """Render run_load() results as a fixed-width or Markdown table, req/s compared with the first row"""
+    header = ["target", "req/s", "vs first", "p50 ms", "p95 ms", "p99 ms", "max ms", "non-2xx", "errors"]
+    rows = [
+        [
+            label,
+            f"{result['requests_per_second']:.1f}",
+            _relative_change(result["requests_per_second"], results[0]["requests_per_second"]) if index else "-",
+            f"{result['p50_ms']:.1f}",
+            f"{result['p95_ms']:.1f}",
+            f"{result['p99_ms']:.1f}",
+            f"{result['max_ms']:.1f}",
+            str(result["non_2xx"]),
+            str(result["errors"]),
+        ]
+        for index, (label, result) in enumerate(zip(labels, results))
+    ]
+
+    if markdown:
+        lines = ["| " + " | ".join(header) + " |", "|" + "|".join(["---"] + ["---:"] * (len(header) - 1)) + "|"]
+        lines += ["| " + " | ".join(row) + " |" for row in rows]
+        return "\n".join(lines)
+
+    width = max(len(label) for label in [header[0], *labels])
+    return "\n".join(
+        f"{row[0]:<{width}} " + " ".join(f"{cell:>9}" for cell in row[1:])
+        for row in [header, *rows]
+    )
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Measure requests/sec and latency for one or more URLs")
+    parser.add_argument("urls", nargs="+", help="URLs to load, one after another")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel keep-alive clients (default: 16)")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds per URL (default: 30)")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds per URL first (default: 5)")
+    parser.add_argument("--labels", nargs="+", help="Names for the URLs in the report (default: the URLs)")
+    parser.add_argument("--markdown", action="store_true", help="Print the report as a Markdown table")
+    args = parser.parse_args(argv)
+
+    labels = args.labels or args.urls
+    if len(labels) != len(args.urls):
+        parser.error(f"--labels needs one name per URL ({len(args.urls)})")
+
+    results = [
+        run_load(url, concurrency=args.concurrency, duration=args.duration, warmup=args.warmup)
+        for url in args.urls
+    ]
+    print(format_results(results, labels, markdown=args.markdown))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Frontend Publisher
+Uploads the Vite build to the frontend S3 bucket and invalidates CloudFront,
+touching only what changed since the last publish
+
+Usage:
+    python scripts/publish_frontend.py dist/ --bucket learning-center-frontend-production \\
+        --distribution-id E123EXAMPLE
+
+The S3 and CloudFront clients are injectable (publish(s3_client=..., cloudfront_client=...)),
+so the pipeline runs offline against moto or a local S3 stand-in.
+"""
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Content-hashed Vite bundles; matches IMMUTABLE_PATHS in infrastructure/cloudfront.py
+IMMUTABLE_PREFIX = "assets/"
+
+# Previous publish's manifest, used to skip unchanged objects. The frontend bucket policy denies
+# CloudFront this prefix (PUBLISH_STATE_PREFIX in infrastructure/cloudfront.py), so it is never served
+MANIFEST_KEY = "_publish/manifest.json"
+
+# Pre-compressed siblings (vite-plugin-compression / brotli -k) are not uploaded: nothing maps
+# Accept-Encoding to their keys, and CloudFront compresses the originals at the edge instead
+PRECOMPRESSED_EXTENSIONS = (".br", ".gz")
+
+CACHE_CONTROL = {
+    "immutable": "public, max-age=31536000, immutable",
+    "html": "no-cache",
+    "default": "public, max-age=300",
+}
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_headers(key: str) -> dict:
+    """Content-Type and Cache-Control for a bucket key"""
+    content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+    if key.startswith(IMMUTABLE_PREFIX):
+        cache_control = CACHE_CONTROL["immutable"]
+    elif key.endswith(".html"):
+        cache_control = CACHE_CONTROL["html"]
+    else:
+        cache_control = CACHE_CONTROL["default"]
+
+    return {
+        "ContentType": content_type,
+        "CacheControl": cache_control,
+    }
+
+
+def build_manifest(dist_dir: str) -> dict:
+    """Map every file under dist_dir to its bucket key, content hash and upload headers"""
+    manifest = {}
+    for root, _, files in os.walk(dist_dir):
+        for filename in files:
+            if filename.endswith(PRECOMPRESSED_EXTENSIONS):
+                continue  # CloudFront compresses the original instead
+            path = os.path.join(root, filename)
+            key = os.path.relpath(path, dist_dir).replace(os.sep, "/")
+            manifest[key] = {
+                "sha256": _file_sha256(path),
+                "size": os.path.getsize(path),
+                **object_headers(key),
+            }
+    return manifest
+
+
+def load_remote_manifest(s3_client, bucket: str) -> dict:
+    """Manifest written by the previous publish, or {} on the first publish"""
+    try:
+        response = s3_client.get_object(Bucket=bucket, Key=MANIFEST_KEY)
+    except s3_client.exceptions.NoSuchKey:
+        return {}
+    return json.loads(response["Body"].read())
+
+
+def diff_manifests(local: dict, remote: dict) -> tuple:
+    """
+    Compare manifests
+
+    Returns:
+        Tuple of (changed keys, removed keys); changed includes new keys and keys
+        whose content or headers differ
+    """
+    changed = sorted(key for key, entry in local.items() if remote.get(key) != entry)
+    removed = sorted(set(remote) - set(local))
+    return changed, removed
+
+
+def invalidation_paths(changed: list, removed: list) -> list:
+    """
+    Paths CloudFront has to forget
+
+    Hashed assets never change in place, so only unhashed paths are invalidated.
+    index.html is also served for "/".
+    """
+    paths = set()
+    for key in changed + removed:
+        if key.startswith(IMMUTABLE_PREFIX):
+            continue
+        paths.add(f"/{key}")
+        if key == "index.html":
+            paths.add("/")
+    return sorted(paths)
+
+
+def _upload(s3_client, dist_dir: str, bucket: str, key: str, entry: dict):
+    with open(os.path.join(dist_dir, key), "rb") as body:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=body,
+            Metadata={"sha256": entry["sha256"]},
+            ContentType=entry["ContentType"],
+            CacheControl=entry["CacheControl"],
+        )
+
+
+def publish(
+    dist_dir: str,
+    bucket: str,
+    s3_client,
+    cloudfront_client=None,
+    distribution_id: str = None,
+    workers: int = 16,
+    prune: bool = False,
+    full: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Publish a frontend build
+
+    Args:
+        dist_dir: Vite build output (dist/)
+        bucket: Frontend bucket name (stack output s3_frontend_bucket)
+        s3_client: boto3 S3 client or compatible stand-in
+        cloudfront_client: boto3 CloudFront client; invalidation is skipped without one
+        distribution_id: Distribution to invalidate (stack output cloudfront_distribution_id)
+        workers: Parallel uploads
+        prune: Delete objects that are no longer in the build. Off by default so browsers
+            still holding the previous index.html can load its hashed bundles
+        full: Ignore the remote manifest and upload everything
+        dry_run: Report what would change without touching S3 or CloudFront
+
+    Returns:
+        Dict with uploaded, deleted and invalidated lists
+    """
+    local = build_manifest(dist_dir)
+    remote = {} if full else load_remote_manifest(s3_client, bucket)
+    changed, removed = diff_manifests(local, remote)
+    removed = removed if prune else []
+    paths = invalidation_paths(changed, removed)
+
+    result = {"uploaded": changed, "deleted": removed, "invalidated": paths}
+    if dry_run:
+        return result
+
+    # HTML last, so a new index.html never references bundles that aren't uploaded yet
+    html = [key for key in changed if local[key]["ContentType"] == "text/html"]
+    other = [key for key in changed if key not in html]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in (other, html):
+            list(executor.map(lambda key: _upload(s3_client, dist_dir, bucket, key, local[key]), batch))
+
+    for start in range(0, len(removed), 1000):
+        s3_client.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": key} for key in removed[start:start + 1000]]},
+        )
+
+    # Carry removed-but-kept keys forward so a later --prune still finds them
+    manifest = {**{key: remote[key] for key in remote if key not in local and key not in removed}, **local}
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=MANIFEST_KEY,
+        Body=json.dumps(manifest, sort_keys=True).encode(),
+        ContentType="application/json",
+        CacheControl="no-store",
+    )
+
+    if paths and cloudfront_client is not None and distribution_id:
+        cloudfront_client.create_invalidation(
+            DistributionId=distribution_id,
+            InvalidationBatch={
+                "Paths": {"Quantity": len(paths), "Items": paths},
+                "CallerReference": f"publish-frontend-{time.time_ns()}",
+            },
+        )
+
+    return result
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Publish the frontend build to S3 and CloudFront")
+    parser.add_argument("dist_dir", help="Vite build output directory")
+    parser.add_argument("--bucket", required=True, help="Frontend S3 bucket")
+    parser.add_argument("--distribution-id", help="CloudFront distribution to invalidate")
+    parser.add_argument("--workers", type=int, default=16, help="Parallel uploads (default: 16)")
+    parser.add_argument("--prune", action="store_true", help="Delete objects no longer in the build")
+    parser.add_argument("--full", action="store_true", help="Upload everything, ignoring the last manifest")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would change")
+    args = parser.parse_args(argv)
+
+    import boto3
+
+    result = publish(
+        dist_dir=args.dist_dir,
+        bucket=args.bucket,
+        s3_client=boto3.client("s3"),
+        cloudfront_client=boto3.client("cloudfront") if args.distribution_id else None,
+        distribution_id=args.distribution_id,
+        workers=args.workers,
+        prune=args.prune,
+        full=args.full,
+        dry_run=args.dry_run,
+    )
+
+    prefix = "[dry run] " if args.dry_run else ""
+    print(f"{prefix}Uploaded {len(result['uploaded'])} object(s), deleted {len(result['deleted'])}")
+    for path in result["invalidated"]:
+        print(f"{prefix}Invalidated {path}")
+
+
+if __name__ == "__main__":
+    main()
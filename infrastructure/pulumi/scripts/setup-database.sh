@@ -44,6 +44,7 @@ PGPASSWORD=$DB_PASS psql -h $RDS_ENDPOINT -U $DB_USER -d $DB_NAME <<EOF
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 CREATE EXTENSION IF NOT EXISTS "vector";
+CREATE EXTENSION IF NOT EXISTS "pg_stat_statements";
 \q
 EOF
 
@@ -0,0 +1,118 @@
+"""
+Unit tests for infrastructure/autoscaling.py
+Runs the Pulumi program code against pulumi.runtime mocks, so no AWS account or stack is needed:
+
+    cd infrastructure/pulumi && python -m pytest tests
+"""
+
+import os
+import sys
+
+import pulumi
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+ALB_ARN_SUFFIX = "app/learning-center-alb/50dc6c495c0c9188"
+TARGET_GROUP_ARN_SUFFIX = "targetgroup/learning-center-tg/73e2d6bc24d8a067"
+
+
+class AwsMocks(pulumi.runtime.Mocks):
+    """Echo resource inputs back as state, adding the ARN suffixes the ALB and target group compute"""
+
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        state = dict(args.inputs)
+        if args.typ == "aws:lb/loadBalancer:LoadBalancer":
+            state["arnSuffix"] = ALB_ARN_SUFFIX
+        elif args.typ == "aws:lb/targetGroup:TargetGroup":
+            state["arnSuffix"] = TARGET_GROUP_ARN_SUFFIX
+        return f"{args.name}-id", state
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        return {}
+
+
+pulumi.runtime.set_mocks(AwsMocks(), preview=False)
+
+import pulumi_aws as aws  # noqa: E402
+from infrastructure.autoscaling import (  # noqa: E402
+    autoscaling_settings,
+    create_service_autoscaling,
+    request_count_resource_label,
+)
+
+
+def _create_web_autoscaling(name_prefix):
+    alb = aws.lb.LoadBalancer(f"{name_prefix}-alb", load_balancer_type="application")
+    target_group = aws.lb.TargetGroup(f"{name_prefix}-tg", port=80, protocol="HTTP", target_type="ip")
+    return create_service_autoscaling(
+        name_prefix=name_prefix,
+        environment="test",
+        cluster_name="learning-center-cluster",
+        service_name="learning-center-service",
+        settings=autoscaling_settings(),
+        request_count_resource_label=request_count_resource_label(alb.arn_suffix, target_group.arn_suffix),
+    )
+
+
+@pulumi.runtime.test
+def test_scalable_target_resource_id():
+    target, _ = _create_web_autoscaling("target-web")
+
+    def check(args):
+        resource_id, scalable_dimension, service_namespace = args
+        assert resource_id == "service/learning-center-cluster/learning-center-service"
+        assert scalable_dimension == "ecs:service:DesiredCount"
+        assert service_namespace == "ecs"
+
+    return pulumi.Output.all(target.resource_id, target.scalable_dimension, target.service_namespace).apply(check)
+
+
+@pulumi.runtime.test
+def test_cpu_and_memory_policies_use_predefined_metrics():
+    _, policies = _create_web_autoscaling("metrics-web")
+
+    def check(args):
+        cpu, memory = args
+        assert cpu["predefined_metric_specification"]["predefined_metric_type"] == "ECSServiceAverageCPUUtilization"
+        assert cpu["target_value"] == 60
+        assert memory["predefined_metric_specification"]["predefined_metric_type"] == "ECSServiceAverageMemoryUtilization"
+        assert memory["target_value"] == 75
+
+    return pulumi.Output.all(
+        policies["cpu"].target_tracking_scaling_policy_configuration,
+        policies["memory"].target_tracking_scaling_policy_configuration,
+    ).apply(check)
+
+
+@pulumi.runtime.test
+def test_request_count_policy_resource_label():
+    _, policies = _create_web_autoscaling("requests-web")
+
+    def check(configuration):
+        metric = configuration["predefined_metric_specification"]
+        assert metric["predefined_metric_type"] == "ALBRequestCountPerTarget"
+        assert metric["resource_label"] == f"{ALB_ARN_SUFFIX}/{TARGET_GROUP_ARN_SUFFIX}"
+        assert configuration["target_value"] == 500
+
+    return policies["requests"].target_tracking_scaling_policy_configuration.apply(check)
+
+
+def test_request_count_policy_skipped_without_resource_label():
+    @pulumi.runtime.test
+    def check():
+        _, policies = create_service_autoscaling(
+            name_prefix="no-alb-web",
+            environment="test",
+            cluster_name="learning-center-cluster",
+            service_name="learning-center-service",
+            settings=autoscaling_settings(),
+        )
+        assert set(policies) == {"cpu", "memory"}
+
+    check()
+
+
+def test_autoscaling_settings_rejects_min_above_max():
+    with pytest.raises(ValueError, match=r"min_capacity \(5\) exceeds max_capacity \(2\)"):
+        autoscaling_settings({"min_capacity": 5, "max_capacity": 2})
@@ -0,0 +1,154 @@
+"""
+Unit tests for scripts/publish_frontend.py
+Publishes a small build to moto's in-memory S3 and CloudFront, so no AWS account is needed
+"""
+
+import json
+import os
+import sys
+
+import boto3
+import pytest
+from moto import mock_aws
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from publish_frontend import MANIFEST_KEY, publish  # noqa: E402
+
+BUCKET = "learning-center-frontend-test"
+
+
+def _write(dist_dir, key, content):
+    path = dist_dir / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def aws():
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=BUCKET)
+        cloudfront = boto3.client("cloudfront", region_name="us-east-1")
+        distribution = cloudfront.create_distribution(
+            DistributionConfig={
+                "CallerReference": "publish-frontend-test",
+                "Comment": "",
+                "Enabled": True,
+                "Origins": {
+                    "Quantity": 1,
+                    "Items": [{
+                        "Id": "s3",
+                        "DomainName": f"{BUCKET}.s3.amazonaws.com",
+                        "S3OriginConfig": {"OriginAccessIdentity": ""},
+                    }],
+                },
+                "DefaultCacheBehavior": {
+                    "TargetOriginId": "s3",
+                    "ViewerProtocolPolicy": "redirect-to-https",
+                    "CachePolicyId": "658327ea-f89d-4fab-a63d-7e88639e58f6",
+                },
+            }
+        )["Distribution"]
+        yield s3, cloudfront, distribution["Id"]
+
+
+@pytest.fixture
+def dist_dir(tmp_path):
+    _write(tmp_path, "index.html", "<html>v1</html>")
+    _write(tmp_path, "favicon.ico", "icon")
+    _write(tmp_path, "assets/app-3f2a1c.js", "console.log(1)")
+    _write(tmp_path, "assets/app-3f2a1c.js.br", "brotli")
+    _write(tmp_path, "assets/app-3f2a1c.js.gz", "gzip")
+    return tmp_path
+
+
+def _publish(aws, dist_dir, **kwargs):
+    s3, cloudfront, distribution_id = aws
+    return publish(
+        dist_dir=str(dist_dir),
+        bucket=BUCKET,
+        s3_client=s3,
+        cloudfront_client=cloudfront,
+        distribution_id=distribution_id,
+        **kwargs,
+    )
+
+
+def _invalidated_paths(aws):
+    _, cloudfront, distribution_id = aws
+    invalidations = cloudfront.list_invalidations(DistributionId=distribution_id)["InvalidationList"]
+    return [
+        cloudfront.get_invalidation(DistributionId=distribution_id, Id=item["Id"])
+        ["Invalidation"]["InvalidationBatch"]["Paths"].get("Items", [])
+        for item in invalidations.get("Items", [])
+    ]
+
+
+def test_first_publish_uploads_originals_with_headers(aws, dist_dir):
+    s3, _, _ = aws
+
+    result = _publish(aws, dist_dir)
+
+    assert result["uploaded"] == ["assets/app-3f2a1c.js", "favicon.ico", "index.html"]
+    keys = sorted(item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET)["Contents"])
+    assert keys == [MANIFEST_KEY, "assets/app-3f2a1c.js", "favicon.ico", "index.html"]
+
+    bundle = s3.head_object(Bucket=BUCKET, Key="assets/app-3f2a1c.js")
+    assert bundle["ContentType"] == "text/javascript"
+    assert bundle["CacheControl"] == "public, max-age=31536000, immutable"
+    assert "ContentEncoding" not in bundle
+    index = s3.head_object(Bucket=BUCKET, Key="index.html")
+    assert index["ContentType"] == "text/html"
+    assert index["CacheControl"] == "no-cache"
+
+    assert result["invalidated"] == ["/", "/favicon.ico", "/index.html"]
+    assert sorted(sum(_invalidated_paths(aws), [])) == ["/", "/favicon.ico", "/index.html"]
+
+
+def test_republish_uploads_and_invalidates_only_changes(aws, dist_dir):
+    _publish(aws, dist_dir)
+    _write(dist_dir, "index.html", "<html>v2</html>")
+    _write(dist_dir, "assets/app-9b7e4d.js", "console.log(2)")
+
+    result = _publish(aws, dist_dir)
+
+    assert result["uploaded"] == ["assets/app-9b7e4d.js", "index.html"]
+    assert result["deleted"] == []
+    assert result["invalidated"] == ["/", "/index.html"]
+    assert len(_invalidated_paths(aws)) == 2
+
+
+def test_unchanged_build_skips_uploads_and_invalidation(aws, dist_dir):
+    _publish(aws, dist_dir)
+
+    result = _publish(aws, dist_dir)
+
+    assert result == {"uploaded": [], "deleted": [], "invalidated": []}
+    assert len(_invalidated_paths(aws)) == 1
+
+
+def test_prune_deletes_keys_dropped_from_the_build(aws, dist_dir):
+    s3, _, _ = aws
+    _publish(aws, dist_dir)
+    (dist_dir / "favicon.ico").unlink()
+
+    kept = _publish(aws, dist_dir)
+    assert kept["deleted"] == []
+    assert "favicon.ico" in json.loads(s3.get_object(Bucket=BUCKET, Key=MANIFEST_KEY)["Body"].read())
+
+    pruned = _publish(aws, dist_dir, prune=True)
+    assert pruned["deleted"] == ["favicon.ico"]
+    assert pruned["invalidated"] == ["/favicon.ico"]
+    keys = [item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET)["Contents"]]
+    assert "favicon.ico" not in keys
+
+
+def test_dry_run_touches_nothing(aws, dist_dir):
+    s3, _, _ = aws
+
+    result = _publish(aws, dist_dir, dry_run=True)
+
+    assert result["uploaded"] == ["assets/app-3f2a1c.js", "favicon.ico", "index.html"]
+    assert s3.list_objects_v2(Bucket=BUCKET)["KeyCount"] == 0
+    assert _invalidated_paths(aws) == []
@@ -0,0 +1,37 @@
+"""
+Unit tests for the subnet and route table selection in infrastructure/vpc_existing.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from infrastructure.vpc_existing import tier_route_table_ids  # noqa: E402
+
+
+def _route_table(route_table_id, subnet_ids=(), main=False):
+    associations = [SimpleNamespace(main=False, subnet_id=subnet_id) for subnet_id in subnet_ids]
+    if main:
+        associations.append(SimpleNamespace(main=True, subnet_id=None))
+    return SimpleNamespace(route_table_id=route_table_id, associations=associations)
+
+
+ROUTE_TABLES = [
+    _route_table("rtb-main", main=True),
+    _route_table("rtb-private", ["subnet-private-a", "subnet-private-b"]),
+    _route_table("rtb-other-team", ["subnet-other-a"]),
+]
+
+
+def test_tier_route_tables_only_cover_selected_subnets():
+    assert tier_route_table_ids(["subnet-private-a", "subnet-private-b"], ROUTE_TABLES) == ["rtb-private"]
+
+
+def test_unassociated_subnets_use_the_main_route_table():
+    assert tier_route_table_ids(["subnet-private-a", "subnet-public-a"], ROUTE_TABLES) == ["rtb-main", "rtb-private"]
+
+
+def test_no_main_route_table_leaves_unassociated_subnets_out():
+    assert tier_route_table_ids(["subnet-public-a"], ROUTE_TABLES[1:]) == []
@@ -34,40 +34,16 @@ fi
 
 echo "📤 Uploading to S3: $S3_BUCKET"
 
-# Upload to S3
-aws s3 sync dist/ "s3://$S3_BUCKET" \
-    --delete \
-    --cache-control "public, max-age=31536000, immutable" \
-    --exclude "*.html" \
-    --exclude "service-worker.js"
-
-# Upload HTML files with shorter cache
-aws s3 sync dist/ "s3://$S3_BUCKET" \
-    --delete \
-    --cache-control "public, max-age=0, must-revalidate" \
-    --include "*.html" \
-    --include "service-worker.js"
+# Upload changed files only and invalidate just the unhashed paths that changed
+CLOUDFRONT_ID=$(cd infrastructure/pulumi && pulumi stack output cloudfront_distribution_id --stack "$PULUMI_STACK" 2>/dev/null || echo "")
 
-# Set index.html as default
-aws s3 cp dist/index.html "s3://$S3_BUCKET/index.html" \
-    --cache-control "public, max-age=0, must-revalidate"
+python3 infrastructure/pulumi/scripts/publish_frontend.py dist/ \
+    --bucket "$S3_BUCKET" \
+    ${CLOUDFRONT_ID:+--distribution-id "$CLOUDFRONT_ID"}
 
-echo "✅ Frontend uploaded to S3"
+echo "✅ Frontend published"
 echo ""
 
-# Invalidate CloudFront cache
-CLOUDFRONT_ID=$(cd infrastructure/pulumi && pulumi stack output cloudfront_distribution_id --stack "$PULUMI_STACK" 2>/dev/null || echo "")
-
-if [ -n "$CLOUDFRONT_ID" ]; then
-    echo "🔄 Invalidating CloudFront cache..."
-    aws cloudfront create-invalidation \
-        --distribution-id "$CLOUDFRONT_ID" \
-        --paths "/*"
-    
-    echo "✅ CloudFront cache invalidated"
-    echo ""
-fi
-
 # Get CloudFront URL
 CLOUDFRONT_URL=$(cd infrastructure/pulumi && pulumi stack output cloudfront_url --stack "$PULUMI_STACK" 2>/dev/null || echo "")
 